@@ -1 +1,4 @@
-from .game import main
+def main():
+    # Imported lazily: the game module opens the window on import, while the engine modules must stay importable headless.
+    from .game import main as game_main
+    game_main()
@@ -0,0 +1,121 @@
+import os
+import time
+import threading
+import pygame
+from pygame import mixer
+from concurrent.futures import ThreadPoolExecutor
+
+class AssetManager:
+    """
+    Loads every image and sound once and keeps them for the whole run, so starting a new game does not hit the disk again.
+    Files can be decoded ahead of time on a background thread (preload()); images are converted to the display format
+    and scaled on the main thread the first time they are asked for.
+    """
+    def __init__(self, asset_path, audio_path):
+        """
+        Initializes the AssetManager object.
+
+        Parameters:
+            asset_path (string): the directory of the images.
+            audio_path (string): the directory of the sounds.
+        """
+        self.__asset_path = asset_path
+        self.__audio_path = audio_path
+        self.__images = {}     # (name, size, alpha) -> converted Surface
+        self.__sounds = {}     # name -> mixer.Sound
+        self.__pending = {}    # ("image" or "sound", name) -> Future of a file decoded in the background
+        self.__timings = {}    # name -> {"load": seconds, "convert": seconds, "background": bool}
+        self.__lock = threading.Lock()
+        self.__executor = None
+
+    def image(self, name, size=None, alpha=False):
+        """
+        Returns an image converted to the display format. The Surface is shared and must not be drawn on.
+
+        Parameters:
+            name (string): the file name of the image.
+            size (tuple): if not None, the (width, height) the image is scaled to. Default=None.
+            alpha (bool): whether the image keeps its per-pixel transparency. Default=False.
+        """
+        key = (name, size, alpha)
+        surface = self.__images.get(key)
+        if surface is None:
+            raw = self.__take("image", name)
+            start = time.perf_counter()
+            surface = raw.convert_alpha() if alpha else raw.convert()
+            if size:
+                surface = pygame.transform.scale(surface, size)
+            with self.__lock:
+                timing = self.__timing(name)
+                timing["convert"] = timing.get("convert", 0) + time.perf_counter() - start
+            self.__images[key] = surface
+        return surface
+
+    def sound(self, name):
+        """
+        Returns a decoded sound.
+
+        Parameters:
+            name (string): the file name of the sound.
+        """
+        sound = self.__sounds.get(name)
+        if sound is None:
+            sound = self.__take("sound", name)
+            self.__sounds[name] = sound
+        return sound
+
+    def preload(self, images=(), sounds=()):
+        """
+        Starts decoding files on a background thread, so that later calls to image() and sound() do not wait for the disk.
+        Files that are already loaded or queued are skipped.
+
+        Parameters:
+            images (list): the file names of the images.
+            sounds (list): the file names of the sounds.
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+            for kind, names in (("image", images), ("sound", sounds)):
+                for name in names:
+                    if (kind, name) in self.__pending or self.__is_loaded(kind, name):
+                        continue
+                    self.__pending[(kind, name)] = self.__executor.submit(self.__load, kind, name, True)
+
+    def get_timings(self):
+        """
+        Returns a dict with the time (in seconds) spent on each file: "load" (reading and decoding), "convert" (display
+        format and scaling, images only) and "background" (whether it was decoded by preload()).
+        """
+        with self.__lock:
+            return {name: dict(timing) for name, timing in self.__timings.items()}
+
+    def __is_loaded(self, kind, name):
+        if kind == "sound":
+            return name in self.__sounds
+        return any(key[0] == name for key in self.__images)
+
+    def __take(self, kind, name):
+        with self.__lock:
+            future = self.__pending.pop((kind, name), None)
+        if future is not None:
+            try:
+                return future.result()
+            except (pygame.error, OSError):
+                pass    # decoded again below, so the error is raised on the main thread
+        return self.__load(kind, name, False)
+
+    def __load(self, kind, name, background):
+        start = time.perf_counter()
+        if kind == "image":
+            asset = pygame.image.load(os.path.join(self.__asset_path, name))
+        else:
+            asset = mixer.Sound(os.path.join(self.__audio_path, name))
+        with self.__lock:
+            timing = self.__timing(name)
+            timing["load"] = time.perf_counter() - start
+            timing["background"] = background
+        return asset
+
+    def __timing(self, name):
+        return self.__timings.setdefault(name, {})
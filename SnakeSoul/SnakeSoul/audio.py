@@ -0,0 +1,92 @@
+import os
+from pygame import mixer
+
+class AudioBank:
+    """
+    Plays the sound effects and the music of the game.
+    Effects are decoded once (through the AssetManager) and played on channels handed out by priority: a new effect takes
+    a free channel, or else the channel of the oldest effect with a lower or equal priority, or else it is dropped.
+    Music tracks are streamed from disk with mixer.music instead of being decoded into memory.
+    """
+    def __init__(self, assets, audio_path, voices=8):
+        """
+        Initializes the AudioBank object. The mixer must already be initialized.
+
+        Parameters:
+            assets (AssetManager): the AssetManager which decodes and keeps the effects.
+            audio_path (string): the directory of the sounds.
+            voices (int): the number of mixer channels used for effects. Default=8.
+        """
+        self.__assets = assets
+        self.__audio_path = audio_path
+        mixer.set_num_channels(voices)
+        self.__channels = [mixer.Channel(i) for i in range(voices)]
+        self.__voices = [(0, 0)]*voices    # (priority, play order) of the last effect played on each channel
+        self.__plays = 0
+
+    def preload(self, names):
+        """
+        Starts decoding effects in the background (see AssetManager.preload()).
+
+        Parameters:
+            names (list): the file names of the effects.
+        """
+        self.__assets.preload(sounds=names)
+
+    def play(self, name, priority=0, volume=0.5):
+        """
+        Plays an effect and returns the Channel it is played on, or None if every channel is busy with a more important effect.
+
+        Parameters:
+            name (string): the file name of the effect.
+            priority (int): the importance of the effect, higher values can cut lower ones off. Default=0.
+            volume (float): the volume of the effect, between 0 and 1. Default=0.5.
+        """
+        index = self.__allocate(priority)
+        if index == -1:
+            return None
+        channel = self.__channels[index]
+        channel.set_volume(volume)
+        channel.play(self.__assets.sound(name))
+        self.__plays += 1
+        self.__voices[index] = (priority, self.__plays)
+        return channel
+
+    def play_music(self, name, loops=-1):
+        """
+        Streams a music track from the start, replacing the current one.
+
+        Parameters:
+            name (string): the file name of the track.
+            loops (int): the number of times the track is repeated, -1 to repeat it forever. Default=-1.
+        """
+        mixer.music.load(os.path.join(self.__audio_path, name))
+        mixer.music.play(loops)
+
+    def pause_music(self):
+        """
+        Pauses the music track.
+        """
+        mixer.music.pause()
+
+    def unpause_music(self):
+        """
+        Resumes the paused music track.
+        """
+        mixer.music.unpause()
+
+    def stop_music(self):
+        """
+        Stops the music track.
+        """
+        mixer.music.stop()
+
+    def __allocate(self, priority):
+        best = -1
+        for i, channel in enumerate(self.__channels):
+            if not channel.get_busy():
+                return i
+            # Steal the oldest effect among the least important ones
+            if self.__voices[i][0] <= priority and (best == -1 or self.__voices[i] < self.__voices[best]):
+                best = i
+        return best
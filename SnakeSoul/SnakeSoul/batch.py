@@ -0,0 +1,384 @@
+import numpy as np
+from .snake import Snake
+from .hawk import Hawk
+from .kinds import KINDS
+from .engine import Engine
+
+class BatchEngine:
+    """
+    Runs N independent games at once. The state of every game is kept in NumPy arrays (one row per game) and step() advances all of them with vectorized operations.
+
+    The rules are the ones of Engine, but the random streams are different: a seed does not give the same game in BatchEngine and Engine.
+    The values of the rules (what eating an Apple or being hit by a Mob does, speeds, durations, spawn waves) are read from
+    kinds.KINDS and Engine.WAVES when the BatchEngine is made, so both engines follow the same definitions.
+
+    State arrays (n = number of games):
+        seg_x, seg_y (n, cells): ring buffer of the Snake's segments, head at index head.
+        stamp (n, rows, cols): for every Cell, the insertion count at which the head last entered it.
+            A Cell belongs to the Snake if stamp >= ins - length, and its segment index is ins - 1 - stamp.
+        fb_x, fb_y, fb_dir, fb_kind, fb_time, fb_alive (n, max_fireballs): the Mobs (fb_kind is a code of mob_codes).
+        ap_x, ap_y, ap_kind, ap_init (n, max_apples): the Apples (ap_kind is a code of apple_codes, NONE for an empty slot).
+        health (n): the Hawk's health.
+        result (n): PLAYING, VICTORY or GAME_OVER.
+    """
+    NONE = 0
+    PLAYING, VICTORY, GAME_OVER = 0, 1, 2
+    def __init__(self, n, shape=(18, 18), lives=3, dt=1/60, max_fireballs=16, max_apples=16):
+        """
+        Initializes the BatchEngine object. reset() must be called before step().
+
+        Parameters:
+            n (int): the number of games.
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns). Default=(18, 18).
+            lives (int): the number of lives of the Snake at the start of a game. Default=3.
+            dt (float): the amount of time (in seconds) every step advances. Default=1/60.
+            max_fireballs (int): the number of Fireballs a game can hold, extra spawns are dropped. Default=16.
+            max_apples (int): the number of Apples a game can hold, extra spawns are dropped. Default=16.
+        """
+        self.n = n
+        self.shape = tuple(shape)
+        self.lives0 = lives
+        self.dt = dt
+        self.rng = np.random.default_rng()
+        self.__rows = np.arange(n)
+        cells = shape[0]*shape[1]
+
+        # Rules: every Apple kind gets a code from 1 (NONE is 0) and every Mob kind a code from 0, and each field of
+        # KINDS becomes an array indexed by these codes
+        apples = [name for name, kind in KINDS.items() if kind["layer"] == "apple"]
+        mobs = [name for name, kind in KINDS.items() if kind["layer"] == "mob"]
+        self.apple_codes = {name: code for code, name in enumerate(apples, 1)}
+        self.mob_codes = {name: code for code, name in enumerate(mobs)}
+        self.__apple_health = np.array([0] + [KINDS[name]["health"] for name in apples], np.int32)
+        self.__apple_lives = np.array([0] + [KINDS[name]["lives"] for name in apples], np.int32)
+        self.__apple_grow = np.array([False] + [KINDS[name]["grow"] for name in apples])
+        self.__apple_decay = np.array([False] + [KINDS[name]["decay"] for name in apples])
+        self.__apple_duration = np.array([0] + [KINDS[name]["duration"] or 0 for name in apples], np.int64)    # 0: forever
+        self.__respawned = [self.apple_codes[name] for name in apples if KINDS[name]["respawn"]]
+        self.__mob_period = np.array([1/KINDS[name]["speed"] for name in mobs])
+        self.__mob_health = np.array([KINDS[name]["health"] for name in mobs], np.int32)
+        # Spawn waves grouped by kind, in the order the Engine fires them: (kind, [(phase, first, period, seconds),...])
+        waves = {}
+        for phase, phase_waves in Engine.WAVES.items():
+            for kind, first, period, seconds in phase_waves:
+                waves.setdefault(kind, []).append((phase, first, period, seconds))
+        self.__waves = list(waves.items())
+
+        # Snake
+        self.seg_x = np.zeros((n, cells), np.int16)
+        self.seg_y = np.zeros((n, cells), np.int16)
+        self.head = np.zeros(n, np.int32)
+        self.length = np.ones(n, np.int32)
+        self.ins = np.ones(n, np.int64)
+        self.stamp = np.full((n, shape[0], shape[1]), -1, np.int64)
+        self.hx = np.zeros(n, np.int16)
+        self.hy = np.zeros(n, np.int16)
+        self.direction = np.ones(n, np.int8)
+        self.snake_dir = np.ones(n, np.int8)
+        self.dir_locked = np.zeros(n, bool)
+        self.move_time = np.zeros(n)
+        self.lives = np.full(n, lives, np.int32)
+        self.__head_moved = np.zeros(n, bool)    # whether the head moved (without restarting) during the current step
+        self.__prev_hx = np.zeros(n, np.int16)
+        self.__prev_hy = np.zeros(n, np.int16)
+
+        # Hawk
+        self.health = np.full(n, Hawk.MAX_HEALTH, np.int32)
+        self.fb_x = np.zeros((n, max_fireballs), np.int16)
+        self.fb_y = np.zeros((n, max_fireballs), np.int16)
+        self.fb_dir = np.zeros((n, max_fireballs), np.int8)
+        self.fb_kind = np.zeros((n, max_fireballs), np.int8)
+        self.fb_time = np.zeros((n, max_fireballs))
+        self.fb_alive = np.zeros((n, max_fireballs), bool)
+        self.ap_x = np.zeros((n, max_apples), np.int16)
+        self.ap_y = np.zeros((n, max_apples), np.int16)
+        self.ap_kind = np.zeros((n, max_apples), np.int8)
+        self.ap_init = np.zeros((n, max_apples), np.int64)
+
+        self.game_time = np.zeros(n)
+        self.is_day = np.ones(n, bool)
+        self.result = np.zeros(n, np.int8)
+
+    def reset(self, seed=None, games=None):
+        """
+        Starts new games.
+
+        Parameters:
+            seed (int): if not None, the random number generator is reseeded with it. Default=None.
+            games (array): indices (or boolean mask) of the games to restart. If None, all games are restarted. Default=None.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        g = self.__rows if games is None else self.__rows[games]
+        cx, cy = self.shape[0]//2, self.shape[1]//2
+
+        self.seg_x[g, 0] = cx
+        self.seg_y[g, 0] = cy
+        self.head[g] = 0
+        self.length[g] = 1
+        self.ins[g] = 1
+        self.stamp[g] = -1
+        self.stamp[g, cx, cy] = 0
+        self.hx[g] = cx
+        self.hy[g] = cy
+        self.direction[g] = 1
+        self.snake_dir[g] = 1
+        self.dir_locked[g] = False
+        self.move_time[g] = 0
+        self.lives[g] = self.lives0
+
+        self.health[g] = Hawk.MAX_HEALTH
+        self.fb_alive[g] = False
+        self.ap_kind[g] = BatchEngine.NONE
+        self.game_time[g] = 0
+        self.is_day[g] = True
+        self.result[g] = BatchEngine.PLAYING
+        self.__spawn_apples(g, self.apple_codes["apple"], np.zeros(len(g), np.int64))
+
+    def step(self, actions=None):
+        """
+        Advances every running game by dt seconds and returns the result array (PLAYING, VICTORY or GAME_OVER per game). Finished games are left untouched.
+
+        Parameters:
+            actions (array): the direction requested for every game (top: -2, right: 1, down: 2, left: -1, none: 0). Default=None.
+        """
+        active = self.result == BatchEngine.PLAYING
+        if not active.any():
+            return self.result
+
+        if actions is not None:
+            actions = np.broadcast_to(np.asarray(actions, np.int8), (self.n,))
+            turn = active & (actions != 0) & ~self.dir_locked & (actions != self.direction)
+            self.direction[turn] = actions[turn]
+            self.dir_locked |= turn
+
+        prev_sec = self.game_time.astype(np.int64)
+        self.game_time[active] += self.dt
+        ticked = active & (self.game_time.astype(np.int64) != prev_sec)
+        if ticked.any():
+            self.__tick_second(self.__rows[ticked])
+
+        self.__head_moved[:] = False
+        self.__move_snakes(active)
+        self.__move_fireballs(active)
+
+        # End game
+        over = active & (self.lives <= 0)
+        self.result[over] = BatchEngine.GAME_OVER
+        self.result[active & ~over & (self.health == 0)] = BatchEngine.VICTORY
+        return self.result
+
+    def get_segments_pos(self, game):
+        """
+        Returns a list of positions of the Snake's segments (head first) of one game.
+
+        Parameters:
+            game (int): the index of the game.
+        """
+        idx = (self.head[game] - np.arange(self.length[game])) % self.seg_x.shape[1]
+        return list(zip(self.seg_x[game, idx].tolist(), self.seg_y[game, idx].tolist()))
+
+    def get_apple_pos(self, game):
+        """
+        Returns a list of Apples' xy position of one game.
+
+        Parameters:
+            game (int): the index of the game.
+        """
+        alive = self.ap_kind[game] != BatchEngine.NONE
+        return list(zip(self.ap_x[game, alive].tolist(), self.ap_y[game, alive].tolist()))
+
+    def get_mob_pos(self, game):
+        """
+        Returns a list of Fireballs' xy position of one game.
+
+        Parameters:
+            game (int): the index of the game.
+        """
+        alive = self.fb_alive[game]
+        return list(zip(self.fb_x[game, alive].tolist(), self.fb_y[game, alive].tolist()))
+
+    def __tick_second(self, g):
+        sec = self.game_time[g].astype(np.int64)
+
+        # Day-time switch
+        self.is_day[g] ^= sec % 60 == 0
+        day = self.is_day[g]
+
+        # Game events: the waves of Engine.WAVES due this second (the ones of the current phase and the "always" ones)
+        for kind, waves in self.__waves:
+            count = np.zeros(len(g), np.int64)
+            for phase, first, period, seconds in waves:
+                due = (sec >= first) & (sec % period < seconds)
+                if phase == "day":
+                    due &= day
+                elif phase == "night":
+                    due &= ~day
+                count += due
+            for k in range(1, count.max(initial=0) + 1):
+                if kind in self.mob_codes:
+                    self.__spawn_fireballs(g[count >= k], self.mob_codes[kind])
+                else:
+                    self.__spawn_apples(g[count >= k], self.apple_codes[kind], sec[count >= k])
+
+        kind = self.ap_kind[g]
+        duration = self.__apple_duration[kind]
+        expired = (duration > 0) & (sec[:, None] - self.ap_init[g] >= duration)
+        kind[expired] = BatchEngine.NONE
+        self.ap_kind[g] = kind
+
+    def __body_mask(self, g):
+        return self.stamp[g] >= (self.ins[g] - self.length[g])[:, None, None]
+
+    def __spawn_fireballs(self, g, kind):
+        if not len(g):
+            return
+        rows, cols = self.shape
+        side = self.rng.integers(4, size=len(g))
+        r = self.rng.random(len(g))
+        x = np.select([side == 0, side == 1], [0, rows-1], (r*rows).astype(np.int16))
+        y = np.select([side == 2, side == 3], [0, cols-1], (r*cols).astype(np.int16))
+        dir = np.array([1, -1, 2, -2], np.int8)[side]
+
+        alive = self.fb_alive[g]
+        slot = np.argmin(alive, axis=1)
+        ok = ~alive.all(axis=1)
+        g, slot = g[ok], slot[ok]
+        self.fb_x[g, slot] = x[ok]
+        self.fb_y[g, slot] = y[ok]
+        self.fb_dir[g, slot] = dir[ok]
+        self.fb_kind[g, slot] = kind
+        self.fb_time[g, slot] = 0
+        self.fb_alive[g, slot] = True
+
+    def __spawn_apples(self, g, kind, init_time):
+        if not len(g):
+            return
+        rows, cols = self.shape
+        free = ~self.__body_mask(g).reshape(len(g), -1)
+        alive = self.ap_kind[g] != BatchEngine.NONE
+        r, s = np.nonzero(alive)
+        free[r, self.ap_x[g][r, s]*cols + self.ap_y[g][r, s]] = False
+
+        # Uniform pick among the free Cells: the k-th free Cell of every row
+        count = free.sum(axis=1)
+        k = (self.rng.random(len(g))*count).astype(np.int64)
+        cell = np.argmax(np.cumsum(free, axis=1) > k[:, None], axis=1)
+        slot = np.argmin(alive, axis=1)
+        ok = (count > 0) & ~alive.all(axis=1)
+
+        g, slot, cell = g[ok], slot[ok], cell[ok]
+        self.ap_x[g, slot] = cell // cols
+        self.ap_y[g, slot] = cell % cols
+        self.ap_kind[g, slot] = kind
+        self.ap_init[g, slot] = init_time[ok]
+
+    def __push_head(self, g, x, y):
+        self.head[g] = (self.head[g] + 1) % self.seg_x.shape[1]
+        self.seg_x[g, self.head[g]] = x
+        self.seg_y[g, self.head[g]] = y
+        self.stamp[g, x, y] = self.ins[g]
+        self.ins[g] += 1
+        self.hx[g] = x
+        self.hy[g] = y
+
+    def __move_snakes(self, active):
+        self.move_time[active] += self.dt
+        speed = np.minimum(2*(self.length//5) + 2, Snake.MAX_SPEED)
+        g = self.__rows[active & (self.move_time >= 1/speed)]
+        if not len(g):
+            return
+        self.move_time[g] -= 1/speed[g]
+        self.dir_locked[g] = False
+        rows, cols = self.shape
+
+        want = self.direction[g]
+        dir = np.where(want + self.snake_dir[g] != 0, want, self.snake_dir[g])
+        self.snake_dir[g] = dir
+        x = self.hx[g] + np.where(np.abs(dir) == 1, dir, 0)
+        y = self.hy[g] + np.where(np.abs(dir) == 2, dir//2, 0)
+
+        # Apples
+        match = (self.ap_kind[g] != BatchEngine.NONE) & (self.ap_x[g] == x[:, None]) & (self.ap_y[g] == y[:, None])
+        eaten = match.any(axis=1)
+        slot = np.argmax(match, axis=1)
+        kind = np.where(eaten, self.ap_kind[g, slot], BatchEngine.NONE)
+        self.ap_kind[g[eaten], slot[eaten]] = BatchEngine.NONE
+
+        # The fields of the kind eaten (all 0 or False for NONE): health given to the Hawk, lives gained (up to 3), growth or decay
+        self.health[g] = np.clip(self.health[g] + self.__apple_health[kind], 0, Hawk.MAX_HEALTH)
+        gain = self.__apple_lives[kind]
+        self.lives[g] = np.where(gain > 0, np.minimum(self.lives[g] + gain, 3), self.lives[g])
+        self.length[g[self.__apple_grow[kind]]] += 1
+        decay = g[self.__apple_decay[kind]]
+        self.lives[decay] -= self.length[decay] == 1
+        self.length[decay] = np.maximum(self.length[decay] - 1, 1)
+
+        # Borders: the Snake restarts from the center and the Fireballs are cleared
+        out = ~eaten & ((x < 0) | (x >= rows) | (y < 0) | (y >= cols))
+        self.lives[g[out]] -= 1
+        self.length[g[out]] = 1
+        self.snake_dir[g[out]] = 1
+        self.move_time[g[out]] = 0
+        self.fb_alive[g[out]] = False
+        x[out] = rows//2
+        y[out] = cols//2
+
+        moved = g[~out]
+        self.__head_moved[moved] = True
+        self.__prev_hx[moved] = self.hx[moved]
+        self.__prev_hy[moved] = self.hy[moved]
+
+        # Self collision with the segments between the head and the tail
+        rest = ~eaten & ~out
+        seg = self.ins[g] - 1 - self.stamp[g, np.where(rest, x, 0), np.where(rest, y, 0)]
+        bitten = rest & (seg >= 1) & (seg <= self.length[g] - 2)
+        self.length[g[bitten]] = seg[bitten]
+        self.lives[g[bitten]] -= 1
+
+        self.__push_head(g, x, y)
+        for code in self.__respawned:
+            respawn = g[kind == code]
+            self.__spawn_apples(respawn, code, self.game_time[respawn].astype(np.int64))
+
+    def __move_fireballs(self, active):
+        alive = self.fb_alive & active[:, None]
+        if not alive.any():
+            return
+        rows, cols = self.shape
+        start_x, start_y = self.fb_x.copy(), self.fb_y.copy()
+        period = self.__mob_period[self.fb_kind]
+        self.fb_time[alive] += self.dt
+        moved = alive & (self.fb_time >= period)
+        self.fb_time[moved] -= period[moved]
+        dir = self.fb_dir
+        self.fb_x += np.where(moved & (np.abs(dir) == 1), dir, 0).astype(np.int16)
+        self.fb_y += np.where(moved & (np.abs(dir) == 2), dir//2, 0).astype(np.int16)
+
+        out = alive & ((self.fb_x < 0) | (self.fb_x >= rows) | (self.fb_y < 0) | (self.fb_y >= cols))
+        self.fb_alive[out] = False
+        alive &= ~out
+
+        x = np.where(alive, self.fb_x, 0)
+        y = np.where(alive, self.fb_y, 0)
+        stamp = self.stamp[self.__rows[:, None], x, y]
+        # A Fireball that swapped Cells with the head went through it during the step: it hits the head
+        swapped = alive & self.__head_moved[:, None] & (x == self.__prev_hx[:, None]) & (y == self.__prev_hy[:, None]) \
+                  & (start_x == self.hx[:, None]) & (start_y == self.hy[:, None])
+        stamp = np.where(swapped, (self.ins - 1)[:, None], stamp)
+        hit = alive & (stamp >= (self.ins - self.length)[:, None])
+        if not hit.any():
+            return
+
+        # Hits are resolved in Fireball slot order, each one against the Snake left by the previous ones
+        for f in np.nonzero(hit.any(axis=0))[0]:
+            g = self.__rows[hit[:, f]]
+            index = self.ins[g] - 1 - stamp[g, f]
+            still = index < self.length[g]
+            g, index = g[still], index[still]
+            head = index == 0
+            self.lives[g[head]] -= 1
+            deleted = np.where(head, 1, self.length[g] - index)
+            self.length[g] = np.maximum(index, 1)
+            self.health[g] = np.clip(self.health[g] + self.__mob_health[self.fb_kind[g, f]]*deleted, 0, Hawk.MAX_HEALTH)
+            self.fb_alive[g, f] = False
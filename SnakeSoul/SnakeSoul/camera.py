@@ -0,0 +1,80 @@
+class Camera:
+    """
+    The window of the world shown on screen when the Grid is larger than the view. It follows a position (the Snake's
+    head) and only scrolls when the position gets closer than a margin to an edge of the view, and never past the world.
+    """
+    def __init__(self, world_shape, view_shape, margin=None):
+        """
+        Initializes the Camera object.
+
+        Parameters:
+            world_shape (tuple): the shape of the world (number of Cell rows, number of Cell columns).
+            view_shape (tuple): the shape of the view (number of Cell rows, number of Cell columns), at most the world's.
+            margin (int): the minimum number of Cells kept between the followed position and the edges of the view. If None, a quarter of the view. Default=None.
+        """
+        self.__world = tuple(world_shape)
+        self.__view = tuple(min(v, w) for v, w in zip(view_shape, world_shape))
+        self.__margin = margin if margin is not None else min(self.__view)//4
+        self.__x = 0
+        self.__y = 0
+
+    def follow(self, pos):
+        """
+        Scrolls the view to keep a position away from its edges, and returns True if it scrolled, else False.
+
+        Parameters:
+            pos (tuple): xy position in the world.
+        """
+        x = self.__scroll(self.__x, pos[0], self.__view[0], self.__world[0])
+        y = self.__scroll(self.__y, pos[1], self.__view[1], self.__world[1])
+        if (x, y) == (self.__x, self.__y):
+            return False
+        self.__x, self.__y = x, y
+        return True
+
+    def center(self, pos):
+        """
+        Moves the view so a position is in its center (as far as the edges of the world allow).
+
+        Parameters:
+            pos (tuple): xy position in the world.
+        """
+        self.__x = min(max(pos[0] - self.__view[0]//2, 0), self.__world[0] - self.__view[0])
+        self.__y = min(max(pos[1] - self.__view[1]//2, 0), self.__world[1] - self.__view[1])
+
+    def to_view(self, pos):
+        """
+        Returns the xy position in the view of a position in the world, or None if it is not visible.
+
+        Parameters:
+            pos (tuple): xy position in the world.
+        """
+        x, y = pos[0] - self.__x, pos[1] - self.__y
+        if 0 <= x < self.__view[0] and 0 <= y < self.__view[1]:
+            return x, y
+        return None
+
+    def get_visible(self):
+        """
+        Returns a list of the xy positions in the world of every visible Cell.
+        """
+        return [(self.__x + i, self.__y + j) for i in range(self.__view[0]) for j in range(self.__view[1])]
+
+    def get_offset(self):
+        """
+        Returns the xy position in the world of the top left Cell of the view.
+        """
+        return self.__x, self.__y
+
+    def get_view_shape(self):
+        """
+        Returns the shape of the view (number of Cell rows, number of Cell columns).
+        """
+        return self.__view
+
+    def __scroll(self, start, pos, view, world):
+        # Smallest move of the view start keeping pos at least margin Cells inside, then clamped to the world
+        margin = min(self.__margin, (view - 1)//2)
+        start = min(start, pos - margin)
+        start = max(start, pos + margin + 1 - view)
+        return min(max(start, 0), world - view)
@@ -0,0 +1,28 @@
+red = (255, 0, 0)
+green = (0, 255, 0)
+lime = (50, 205, 50)
+black = (0, 0, 0)
+white = (255, 255, 255)
+dark_yellow = (182, 143, 64)
+gray = (128, 128, 128)
+dark_green = (21, 54, 19)
+purple = (128, 0, 128)
+orange = (255, 165, 0)
+gold = (255, 215, 0)
+
+# Every color gets an integer code (its index in PALETTE): Objects and Cells store the code instead of the tuple
+PALETTE = [black, red, green, lime, white, dark_yellow, gray, dark_green, purple, orange, gold]
+CODES = {color: code for code, color in enumerate(PALETTE)}
+
+def code(color):
+    """
+    Returns the integer code of a color, adding the color to the palette if it is not in it yet.
+
+    Parameters:
+        color (tuple): RGB color code.
+    """
+    color = tuple(color)
+    if color not in CODES:
+        CODES[color] = len(PALETTE)
+        PALETTE.append(color)
+    return CODES[color]
@@ -0,0 +1,436 @@
+import random
+import numpy as np
+from .kinds import KINDS
+from .snake import Snake
+from .hawk import Hawk
+from .occupancy import Occupancy
+from .store import EntityStore
+from .scheduler import Scheduler
+
+class GameState:
+    """
+    Holds everything that describes a running game (Snake, Hawk, game time, day/night phase,...).
+    """
+    def __init__(self, shape, lives, seed=None):
+        """
+        Initializes the GameState object.
+
+        Parameters:
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns).
+            lives (int): the number of lives of the Snake.
+            seed (int): the seed of the random number generator. If None, the game is not reproducible. Default=None.
+        """
+        self.shape = shape
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.occupancy = Occupancy(shape)
+        self.snake = Snake(shape[0]//2, shape[1]//2, lives, self.occupancy, shape[0]*shape[1])
+        self.hawk = Hawk(shape, self.rng, self.occupancy)
+        self.direction = self.snake.getDirection()
+        self.is_dir_updated = False
+        self.game_time = 0
+        self.is_day = True
+        self.result = None    # None while playing, then "victory" or "game_over"
+        self.scheduler = Scheduler()
+        self.waves = {}       # index of a wave of the current phase -> its scheduler entry
+        self.expiries = {}    # id of an Apple (in the EntityStore) -> scheduler entry of its expiry
+
+    def is_over(self):
+        """
+        Returns True if the game has ended (victory or game over), else False.
+        """
+        return self.result is not None
+
+class Engine:
+    """
+    Runs the rules of the game on a GameState. It has no display, audio or clock dependency: time only advances through step().
+    """
+    DAYTIME = 60
+    # Spawn waves of each phase: (kind, first second, period, seconds). A Mob or Apple of the kind (see kinds.KINDS) is
+    # spawned on every game second s from the first second on with s % period < seconds. The "always" waves run in both phases.
+    WAVES = {
+        "day": [("fireball", 15, 15, 5), ("golden_apple", 30, 30, 1)],
+        "night": [("fireball", 15, 15, 10)],
+        "always": [("poison_apple", 20, 20, 10)],
+    }
+    # Order of the events due on the same second
+    FLIP, PHASE_WAVE, ALWAYS_WAVE, EXPIRY = 0, 1, 50, 100
+    # Margin added to the jumps of fast_forward(), so that rounding cannot leave a timer just below its threshold
+    EPSILON = 1e-9
+    def __init__(self, shape=(18, 18), lives=3):
+        """
+        Initializes the Engine object.
+
+        Parameters:
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns). Default=(18, 18).
+            lives (int): the number of lives of the Snake at the start of a game. Default=3.
+        """
+        self.__shape = tuple(shape)
+        self.__lives = lives
+        self.__state = None
+        self.__head_path = None    # (previous, new) position of the Snake's head if it moved during the current step
+        self.__mob_spawned = False    # whether a Mob was spawned during the current step
+
+    def reset(self, seed=None):
+        """
+        Starts a new game and returns its GameState.
+
+        Parameters:
+            seed (int): the seed of the random number generator. If None, a random seed is picked (and kept in the GameState, so the game can still be replayed). Default=None.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.__state = GameState(self.__shape, self.__lives, seed)
+        self.__spawn_apple("apple")
+        self.__state.scheduler.schedule(Engine.DAYTIME, ("flip", Engine.DAYTIME), Engine.FLIP)
+        self.__schedule_waves("always", 1)
+        self.__schedule_waves("day", 1)
+        return self.__state
+
+    def step(self, action=None, dt=1/60):
+        """
+        Advances the game by dt seconds and returns the list of events that happened (fireball, footstep, coin, damage, victory, game_over).
+
+        Parameters:
+            action (int): the direction requested by the player (top: -2, right: 1, down: 2, left: -1). If None, the direction is kept. Default=None.
+            dt (float): the amount of time (in seconds) to advance. Default=1/60.
+        """
+        state = self.__state
+        events = []
+        if state.is_over():
+            return events
+
+        if action and not state.is_dir_updated and action != state.direction:
+            state.is_dir_updated = True
+            state.direction = action
+
+        state.game_time += dt
+        self.__mob_spawned = False
+        for event in state.scheduler.pop_due(int(state.game_time)):
+            self.__fire(event, events)
+
+        self.__head_path = None
+        self.__move_snake(dt, events)
+        self.__move_mobs(dt, events)
+
+        # End game
+        if state.snake.is_dead():
+            state.result = "game_over"
+            events.append(state.result)
+        elif state.hawk.is_dead():
+            state.result = "victory"
+            events.append(state.result)
+        return events
+
+    def fast_forward(self, duration, action=None):
+        """
+        Advances the game by duration seconds in discrete-event mode and returns the list of events that happened.
+        Between two events the Snake goes straight and every Fireball moves in a straight line at a constant speed, so
+        the next moment something can happen is computed in closed form instead of by stepping: the first Cell of the
+        Snake's path out of the Grid, with an Apple or with its body, the first crossing of each Fireball with the Snake
+        (its exit from the Grid needs no stop) and the next scheduled event (spawn wave, day/night switch, Apple expiry).
+        The game jumps straight to it, moving the Snake and the Fireballs by as many Cells as they go meanwhile, and
+        step() runs the event itself. While the Snake's path is not known yet (a direction request is pending, even a
+        reversed one, or action asks for a new one), it steps to the next move instead. The rules are the ones of step(),
+        only without the rounding of the moves to frames.
+
+        Parameters:
+            duration (float): the amount of game time (in seconds) to advance.
+            action (int): the direction requested by the player during the whole duration (see step()). Default=None.
+        """
+        state = self.__state
+        events = []
+        end = state.game_time + duration
+        while not state.is_over() and state.game_time < end:
+            left = end - state.game_time
+            jump = self.__time_to_next_event(left, action)
+            if jump is None:
+                jump = min(self.__time_to_next_move(), left)
+            # Right before the event, then step() runs it (or just reaches the end)
+            if jump > Engine.EPSILON:
+                self.__advance(jump - Engine.EPSILON, events)
+            events += self.step(action, min(2*Engine.EPSILON, end - state.game_time))
+        return events
+
+    def get_state(self):
+        """
+        Returns the GameState of the current game.
+        """
+        return self.__state
+
+    def get_shape(self):
+        """
+        Returns the shape of the Grid (number of Cell rows, number of Cell columns).
+        """
+        return self.__shape
+
+    def check_boundaries(self, pos):
+        """
+        Returns True if the position is out of the Grid, else False.
+
+        Parameters:
+            pos (tuple): xy position to be checked.
+        """
+        return pos[0] >= self.__shape[0] or pos[0] < 0 or pos[1] >= self.__shape[1] or pos[1] < 0
+
+    def __time_to_next_move(self):
+        state = self.__state
+        times = [state.snake.get_time_to_move()]
+        mob_time = state.hawk.get_mobs().get_time_to_move()
+        if mob_time is not None:
+            times.append(mob_time)
+        next_time = state.scheduler.get_next_time()
+        if next_time is not None:
+            times.append(next_time - state.game_time)
+        return max(min(times), 0)
+
+    def __time_to_next_event(self, horizon, action):
+        # Time (in seconds, at most horizon) before anything else than moving the Snake and the Mobs along their lines can
+        # happen, or None if the Snake may turn (a direction request is pending or action asks for a new one) or if nothing
+        # moves more than once before horizon (stepping from move to move is cheaper then)
+        state = self.__state
+        snake = state.snake
+        direction = snake.getDirection()
+        if state.is_dir_updated or (action and action != state.direction):
+            return None
+        if state.direction != direction and state.direction + direction != 0:
+            return None
+        next_time = state.scheduler.get_next_time()
+        if next_time is not None:
+            horizon = min(horizon, next_time - state.game_time)
+
+        # The head goes through head + j*step at the times first + (j-1)*period, until a Cell out of the Grid, with an
+        # Apple or with a segment (a possible bite) ends the straight line
+        first, period = snake.get_time_to_move(), 1/snake.get_speed()
+        step = int(EntityStore.STEP_X[direction + 2]), int(EntityStore.STEP_Y[direction + 2])
+        head = snake.get_head()
+        moves = int((horizon - first)//period) + 1 if horizon >= first else 0
+        mobs = state.hawk.get_mobs()
+        mob_time = mobs.get_time_to_move()
+        if moves <= 1 and (mob_time is None or horizon < mob_time + mobs.get_column("period").min()):
+            return None
+        for j in range(1, moves + 1):
+            pos = (head[0] + j*step[0], head[1] + j*step[1])
+            if self.check_boundaries(pos) or state.occupancy.has(Occupancy.APPLE, pos) or state.occupancy.has(Occupancy.SNAKE, pos):
+                horizon = first + (j-1)*period
+                moves = j - 1
+                break
+        if len(mobs):
+            horizon = min(horizon, self.__time_to_first_hit(horizon, head, step, first, period, moves))
+        return max(horizon, 0)
+
+    def __time_to_first_hit(self, horizon, head, step, first, period, moves):
+        # Time of the first hit of a Mob on the Snake before horizon (or horizon), while the head goes straight for moves
+        # Cells. Mob k is at position r (start + r*its step) from the time of its r-th move, u[k, r], on.
+        state = self.__state
+        mobs = state.hawk.get_mobs()
+        eps = Engine.EPSILON
+        mob_period = mobs.get_column("period")[:, None]
+        u_first = mob_period[:, 0] - mobs.get_column("timer")
+        moving = np.isfinite(u_first)
+        count = int(((horizon - u_first[moving])//mob_period[moving, 0]).max()) + 1 if moving.any() else 0
+        count = max(min(count, max(self.__shape) + 1), 0)
+        r = np.arange(count + 2)
+        with np.errstate(invalid="ignore"):
+            u = u_first[:, None] + (r - 1)*mob_period
+        u[~moving, 1:] = np.inf
+        u[:, 0] = -np.inf
+        direction = mobs.get_column("direction") + 2
+        x = mobs.get_column("x")[:, None] + EntityStore.STEP_X[direction][:, None]*r
+        y = mobs.get_column("y")[:, None] + EntityStore.STEP_Y[direction][:, None]*r
+        inside = (x >= 0) & (x < self.__shape[0]) & (y >= 0) & (y < self.__shape[1]) & (u < horizon)
+
+        # Position along the Snake's line: q Cells ahead of the head (-1 off the line or behind it), reached at s
+        dx, dy = x - head[0], y - head[1]
+        q = dx*step[0] + dy*step[1]
+        q = np.where((dx*step[1] - dy*step[0] == 0) & (q >= 0), q, -1)
+        s = first + (q - 1)*period
+        # Number of moves of the head by time t (moves at the same time as a Mob come first)
+        m = np.clip(np.floor((u + eps - first)/period) + 1, 0, moves).astype(np.int64)
+        length = state.snake.get_length()
+
+        # A Mob moves onto a segment: a new one on the line or an old one the tail has not left yet
+        hit = inside & (q >= 1) & (q <= m) & (q >= m - length + 1)
+        body = inside & (state.occupancy.count_many(Occupancy.SNAKE, x.ravel(), y.ravel()).reshape(x.shape) > 0)
+        if body.any():
+            segments = {}
+            for index, pos in reversed(list(enumerate(state.snake.get_segments_pos()))):
+                segments[pos] = index
+            for k, i in zip(*body.nonzero()):
+                if segments[(int(x[k, i]), int(y[k, i]))] <= length - 1 - m[k, i]:
+                    hit[k, i] = True
+        times = np.where(hit, u, np.inf)
+        times[:, 0] = np.where(hit[:, 0], first, np.inf)    # a Mob already on a segment is hit on the next move of the head
+
+        # The head moves onto a Mob that is still there
+        ahead = inside & (q >= 1) & (q <= moves)
+        ahead &= (u <= s + eps) & (s + eps < np.concatenate([u[:, 1:], np.full((len(u), 1), np.inf)], axis=1))
+        times = np.minimum(times, np.where(ahead, s, np.inf))
+
+        # A Mob and the head swap Cells at the same time (they go through each other)
+        q_from = np.concatenate([np.full((len(q), 1), -1), q[:, :-1]], axis=1)
+        s_from = first + (q_from - 1)*period
+        swap = inside & (q_from >= 1) & (q_from <= moves) & (q == q_from - 1) & (np.abs(u - s_from) <= eps)
+        times = np.minimum(times, np.where(swap, s_from, np.inf))
+        return min(horizon, float(times.min()))
+
+    def __advance(self, dt, events):
+        # Moves the Snake and the Mobs along their lines for dt seconds, when nothing else can happen meanwhile
+        state = self.__state
+        state.game_time += dt
+        snake = state.snake
+        for _ in range(snake.advance(dt)):
+            snake.update_pos(state.direction)
+            snake.move()
+            events.append("footstep")
+            state.is_dir_updated = False
+        state.hawk.advance(dt)
+
+    def __schedule_waves(self, phase, second):
+        for index in range(len(Engine.WAVES[phase])):
+            self.__schedule_wave(phase, index, second)
+
+    def __schedule_wave(self, phase, index, second):
+        # Schedules the next spawn of a wave, at a game second or later
+        state = self.__state
+        _, first, period, seconds = Engine.WAVES[phase][index]
+        s = max(second, first)
+        if s % period >= seconds:
+            s += period - s % period
+        order = Engine.ALWAYS_WAVE if phase == "always" else Engine.PHASE_WAVE
+        entry = state.scheduler.schedule(s, ("wave", phase, index, s), order + index)
+        if phase != "always":
+            state.waves[index] = entry
+
+    def __fire(self, event, events):
+        state = self.__state
+        hawk = state.hawk
+        if event[0] == "flip":
+            # Day-time switch: the waves of the previous phase are dropped and the ones of the new phase start now
+            second = event[1]
+            state.is_day = not state.is_day
+            for entry in state.waves.values():
+                state.scheduler.cancel(entry)
+            state.waves = {}
+            self.__schedule_waves("day" if state.is_day else "night", second)
+            state.scheduler.schedule(second + Engine.DAYTIME, ("flip", second + Engine.DAYTIME), Engine.FLIP)
+        elif event[0] == "wave":
+            _, phase, index, second = event
+            kind = Engine.WAVES[phase][index][0]
+            if KINDS[kind]["layer"] == "mob":
+                events.append(kind)
+                hawk.spawn_mob(kind)
+                self.__mob_spawned = True
+            else:
+                self.__spawn_apple(kind)
+            self.__schedule_wave(phase, index, second + 1)
+        elif event[0] == "expiry":
+            id = event[1]
+            del state.expiries[id]
+            hawk.pop_apple(hawk.get_apples().index_of(id))
+
+    def __spawn_apple(self, kind):
+        # Spawns an Apple and schedules its expiry if it has a duration
+        state = self.__state
+        apples = state.hawk.get_apples()
+        index = state.hawk.spawn_apple(kind, [], state.game_time)
+        if index != -1 and apples.get_expiry(index) is not None:
+            id = apples.get_id(index)
+            state.expiries[id] = state.scheduler.schedule(apples.get_expiry(index), ("expiry", id), Engine.EXPIRY)
+
+    def __move_snake(self, dt, events):
+        state = self.__state
+        snake = state.snake
+        hawk = state.hawk
+        if not snake.is_move(dt):
+            return
+
+        events.append("footstep")
+        respawned = False
+        previous_head = snake.get_head()
+        snake.update_pos(state.direction)
+        index = -1
+        if state.occupancy.has(Occupancy.APPLE, snake.get_head()):
+            index = hawk.get_apples().find(snake.get_head())
+        if index != -1:
+            entry = state.expiries.pop(hawk.get_apples().get_id(index), None)
+            if entry:
+                state.scheduler.cancel(entry)
+            name = hawk.pop_apple(index)
+            kind = KINDS[name]
+            events.append(kind["event"])
+            self.__change_health(kind["health"])
+            for _ in range(kind["lives"]):
+                snake.gain_live()
+            if kind["grow"]:
+                snake.grow()
+            else:
+                if kind["decay"]:
+                    snake.decay(-1)
+                snake.move()
+            if kind["respawn"]:
+                self.__spawn_apple(name)
+        elif self.check_boundaries(snake.get_head()):
+            snake.respawn(self.__shape[0]//2, self.__shape[1]//2, snake.get_lives()-1)
+            hawk.reset_mob()
+            respawned = True
+        elif snake.self_collide():
+            snake.lose_live()
+        else:
+            snake.move()
+        if not respawned:
+            self.__head_path = (previous_head, snake.get_head())
+        state.is_dir_updated = False
+
+    def __change_health(self, value):
+        # Heals the Hawk (positive value) or damages it (negative value)
+        hawk = self.__state.hawk
+        if value > 0:
+            hawk.heal(value)
+        elif value < 0:
+            hawk.damage(-value)
+
+    def __move_mobs(self, dt, events):
+        state = self.__state
+        hawk = state.hawk
+        mobs = hawk.get_mobs()
+        # The Cells the Mobs start from only matter if the head moved
+        head_path = self.__head_path
+        if head_path:
+            start_x, start_y = mobs.get_column("x").copy(), mobs.get_column("y").copy()
+        moved = hawk.update(dt)
+        # Every hit was resolved on the previous step: there can only be new ones if a Mob or the head moved, or a Mob spawned
+        if not len(mobs) or not (moved or head_path or self.__mob_spawned):
+            return
+
+        # Find every hit first, on whole columns: the Mobs out of the Grid, the ones that swapped Cells with the head
+        # (they went through each other during the step) and the ones on a Cell of the Snake layer of the Occupancy index
+        x, y = mobs.get_column("x"), mobs.get_column("y")
+        # Negative coordinates become huge once seen as unsigned, so one comparison per axis finds the Mobs out of the Grid
+        out = (x.view(np.uint32) >= self.__shape[0]) | (y.view(np.uint32) >= self.__shape[1])
+        hit = state.occupancy.count_many(Occupancy.SNAKE, x, y) > 0
+        swapped = None
+        if head_path:
+            (head_x, head_y), (new_x, new_y) = head_path
+            swapped = (x == head_x) & (y == head_y) & (start_x == new_x) & (start_y == new_y)
+            swapped &= ~out
+            hit |= swapped
+        removed = out.nonzero()[0].tolist()
+        hits = hit.nonzero()[0].tolist()
+
+        # Then resolve them in the order of the Mobs: a hit only counts if its segment was not cut off by an earlier one
+        if hits:
+            snake = state.snake
+            segments = {}
+            for index, pos in reversed(list(enumerate(snake.get_segments_pos()))):
+                segments[pos] = index
+            for i in hits:
+                index = 0 if swapped is not None and swapped[i] else segments[mobs.get_pos(i)]
+                if index >= snake.get_length():
+                    continue
+                kind = KINDS[mobs.get_kind(i)]
+                events.append(kind["event"])
+                l = snake.decay(index)
+                self.__change_health(kind["health"]*l)
+                removed.append(i)
+        hawk.remove_mobs(removed)
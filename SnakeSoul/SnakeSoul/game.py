@@ -1,181 +1,37 @@
 import os
 import pygame
 import random
+import time
 import yaml
 from pygame import mixer
+from . import colors
+from .engine import Engine
+from .occupancy import Occupancy
+from .object import TYPES, TYPE_CODES
+from .text import FontRegistry, TextCache
+from .postprocess import BlurCache, freeze_frame
+from .scene import Scene
+from .assets import AssetManager
+from .audio import AudioBank
+from .timestep import FixedTimestep
+from .replay import Replay
+from .gridrender import GridRenderer
+from .camera import Camera
+from .minimap import Minimap
 
 with open(os.path.join("SnakeSoul", "config.yml"), "r") as f:
     config = yaml.load(f, Loader=yaml.SafeLoader)
 
-mixer.init()
-
-mixer.Channel(1).set_volume(0.5)
-mixer.Channel(2).set_volume(0.5)
-mixer.Channel(3).set_volume(0.5)
-mixer.Channel(4).set_volume(0.5)
+audio_config = config.get("audio", {})
+frequency = audio_config.get("frequency", 44100)
+buffer = audio_config.get("buffer", 512)
+if audio_config.get("latency"):
+    buffer = 1 << max(0, int(frequency*audio_config["latency"]/1000) - 1).bit_length()
+mixer.init(frequency=frequency, buffer=buffer)
 
 asset_path = os.path.join("SnakeSoul", "assets")
 audio_path = os.path.join("SnakeSoul", "audio")
 
-# Colors
-red = (255, 0, 0)
-green = (0, 255, 0)
-lime = (50, 205, 50)
-black = (0, 0, 0)
-white = (255, 255, 255)
-dark_yellow = (182, 143, 64)
-gray = (128, 128, 128)
-dark_green = (21, 54, 19)
-purple = (128, 0, 128)
-orange = (255, 165, 0)
-gold = (255, 215, 0)
-
-class Object:
-    """
-    Represents an Object on the Grid (Snake's segment, Apple, Fireball,...).
-    """
-    def __init__(self, x, y, color, type):
-        """
-        Initializes the Object object.
-
-        Parameters:
-            x (int): the x position on the Grid.
-            y (int): the y position on the Grid.
-            color (tuple): RGB color code for the Object.
-            type (string): the type of the Object.
-        """
-        self._x = x
-        self._y = y
-        self._color = color
-        self._type = type
-
-    def get_x(self):
-        """
-        Returns the x position on the Grid.
-        """
-        return self._x
-    
-    def get_y(self):
-        """
-        Returns the y position on the Grid.
-        """
-        return self._y
-    
-    def get_pos(self):
-        """
-        Returns the xy position on the Grid (in tuple).
-        """
-        return self._x, self._y
-
-    def get_color(self):
-        """
-        Returns RGB color code of the Object (in tuple).
-        """
-        return self._color
-
-    def set_color(self, color):
-        """
-        Changes the color of the Object.
-
-        Parameters:
-            color (tuple): new RGB color code to change to.
-        """
-        self._color = color
-
-    def get_type(self):
-        """
-        Returns the type of the Object.
-        """
-        return self._type
-    
-    def collide(self, poses):
-        """
-        Returns True if the xy position of the Object is the same with any of the given positions, else False.
-
-        Parameters:
-            poses (list): a list of xy positions on the Grid to be checked.
-        """
-        for i in range(len(poses)):
-            if (self._x, self._y) == poses[i]:
-                return i
-        return -1
-
-class Apple(Object):
-    """
-    Class for Apple object, inherits Object class.
-    """
-    def __init__(self, x, y, duration=None, init_time=None):
-        """
-        Initializes the Apple object.
-        
-        Parameters:
-            x (int): the x position on grid.
-            y (int): the y position on grid.
-            duration (int): the amount of time (in seconds) in which the apple stays on the screen. If None, it stays forever. Default=None.
-            init_time (float): the game time (in seconds) in which the apple is created. Default=None.
-        """
-        super().__init__(x, y, red, "apple")
-        self.__duration = duration
-        self.__init_time = int(init_time) if init_time else None
-
-    def is_timeup(self, time):
-        """
-        Returns True if the duration the apple stays on screen greater than the initialized duration. If init_time or duration is None, returns None.
-
-        Parameters:
-            time (float): the game time (in seconds) in which the function is called.
-        """
-        if self.__init_time and self.__duration:
-            return int(time) - self.__init_time >= self.__duration
-        return None
-
-    def get_time(self, time):
-        """
-        Returns the amount of time left (in seconds) before the Apple disappears. If init_time or duration is None, returns None
-
-        Parameters:
-            time (float): the game time (in seconds) in which the function is called.
-        """
-        if self.__init_time and self.__duration:
-            return str(self.__duration - int(time) + self.__init_time)
-        return None
-
-class GoldenApple(Apple):
-    """
-    Class for GoldenApple object, inherits Apple class.
-    """
-    def __init__(self, x, y, duration, init_time):
-        """
-        Initializes the GoldenApple object.
-
-        Parameters:
-            x (int): the x position on grid.
-            y (int): the y position on grid.
-            duration (int): the amount of time (in seconds) in which the apple stays on the screen. If None, it stays forever.
-            init_time (float): the game time (in seconds) in which the apple is created.
-        """
-        super().__init__(x, y, duration, init_time)
-        self._color = gold
-        self._type = "golden_apple"
-
-class PoisonApple(Apple):
-    """
-    Class for PoisonApple object, inherits Apple class.
-    """
-    def __init__(self, x, y, duration, init_time):
-        """
-        Initializes the PoisonApple object.
-
-        Parameters:
-            x (int): the x position on grid.
-            y (int): the y position on grid.
-            duration (int): the amount of time (in seconds) in which the apple stays on the screen. If None, it stays forever.
-            init_time (float): the game time (in seconds) in which the apple is created.
-        """
-        super().__init__(x, y, duration, init_time)
-        self._color = gray
-        self._type = "poison_apple"
-
 class Bar:
     """
     Class for Bar object.
@@ -222,6 +78,12 @@ class Bar:
         pygame.draw.rect(screen, self.__color, [self.__x, self.__y, self.__w*self.__val/self.__max_val, self.__h])
         pygame.draw.rect(screen, "black", [self.__x, self.__y, self.__w, self.__h], 1)
 
+    def get_rect(self):
+        """
+        Returns the area of the screen covered by the Bar (pygame.Rect).
+        """
+        return pygame.Rect(self.__x, self.__y, self.__w, self.__h)
+
 class Button():
     """
     Class for the Button object.
@@ -242,7 +104,9 @@ class Button():
         self.font = font
         self.base_color, self.hovering_color = base_color, hovering_color
         self.text_input = text_input
-        self.text = self.font.render(self.text_input, True, self.base_color)
+        self.base_text = text_cache.render(self.font, self.text_input, self.base_color)
+        self.hovering_text = text_cache.render(self.font, self.text_input, self.hovering_color)
+        self.text = self.base_text
         self.text_rect = self.text.get_rect(center=(self.x_pos, self.y_pos))
 
     def update(self, screen):
@@ -273,79 +137,15 @@ class Button():
             position (tuple): (x, y) position of the mouse.
         """
         if position[0] in range(self.text_rect.left, self.text_rect.right) and position[1] in range(self.text_rect.top, self.text_rect.bottom):
-            self.text = self.font.render(self.text_input, True, self.hovering_color)
+            self.text = self.hovering_text
         else:
-            self.text = self.font.render(self.text_input, True, self.base_color)
-
-class Entity(Object):
-    """
-    Class for Entity object, inherits the Object class.
-    """
-    def __init__(self, x, y, dir, color, speed):
-        """
-        Initializes the Entity object.
-
-        Parameters:
-            x (int): the x position on the Grid.
-            y (int): the y position on the Grid.
-            dir (int): the direction the Entity faces (top: -2, right: 1, down: 2, left: -1).
-            color (tuple): RGB color code for the Entity's color.
-            speed (int): the movement speed of the Entity (cells per second).
-        """
-        super().__init__(x, y, color, "mob")
-        self._speed = speed
-        self._direction = dir    # top: -2, right: 1, down: 2, left: -1
-        self._current_time = 0
-
-    def update_pos(self, key=None):
-        """
-        Updates the Entity's position (and direction) based on key input.
-
-        Parameters:
-            key (int): one of the position's valid value (-2, 1, 2, -1). If key is None or the new direction is opposite with the current direction, direction will not be updated. Default=None.
-        """
-        if key:
-            if self._direction + key != 0:
-                self._direction = key
-
-        self._x += self._direction if abs(self._direction) == 1 else 0
-        if self._direction == 2:
-            self._y += 1
-        elif self._direction == -2:
-            self._y -= 1
-
-    def is_move(self, dt):
-        """
-        Returns True if the snake hasn't moved after 1/speed (seconds). 
-
-        Parameters:
-            dt (float): the amount of time (in seconds) between function calls.
-        """
-        self._current_time += dt
-        if self._current_time > (1/self._speed):
-            self._current_time = 0
-            return True
-        return False
-
-class Fireball(Entity):
-    """
-    Class for Fireball object, inherits Entity class.
-    """
-    def __init__(self, x, y, dir):
-        """
-        Initializes Fireball object.
-
-        Parameters:
-            x (int): the x position on the Grid.
-            y (int): the y position on the Grid.
-            dir (int): the direction the Fireball faces (top: -2, right: 1, down: 2, left: -1).
-        """
-        super().__init__(x, y, dir, purple, 5)
+            self.text = self.base_text
 
 class Cell:
     """
-    Class for Cell object.
+    Class for Cell object. The type and color are kept as integer codes (see object.TYPES and colors.PALETTE).
     """
+    __slots__ = ("__type", "__color", "__text")
     def __init__(self, type, color, text=None):
         """
         Initializes the Cell object.
@@ -355,15 +155,15 @@ class Cell:
             color (tuple): RGB color code of the Cell.
             text (string): the text to be displayed on top of the Cell (if not None). Default=None.
         """
-        self.__type = type
-        self.__color = color
+        self.__type = TYPE_CODES[type]
+        self.__color = colors.code(color) if color else -1
         self.__text = text
 
     def get_type(self):
         """
         Returns type of the Cell.
         """
-        return self.__type
+        return TYPES[self.__type]
 
     def set_type(self, type):
         """
@@ -372,13 +172,13 @@ class Cell:
         Parameters:
             type (string): new string for the type of the Cell.
         """
-        self.__type = type
+        self.__type = TYPE_CODES[type]
     
     def get_color(self):
         """
-        Returns the RGB color code of the Cell.
+        Returns the RGB color code of the Cell (None if it is empty).
         """
-        return self.__color
+        return colors.PALETTE[self.__color] if self.__color != -1 else None
     
     def set_color(self, color):
         """
@@ -387,7 +187,7 @@ class Cell:
         Parameters:
             color (tuple): new RGB color code for the color of the Cell.
         """
-        self.__color = color
+        self.__color = colors.code(color) if color else -1
 
     def get_text(self):
         """
@@ -407,6 +207,8 @@ class Cell:
 class Grid:
     """
     Class for Grid object.
+    It is updated incrementally: every change of a Cell is recorded, and get_dirty_rects() only returns (and forgets) those.
+    The colors are drawn by a GridRenderer (one scaled blit and one outline overlay), only the texts are drawn per Cell.
     """
     def __init__(self, x_offset, y_offset, width, height, dim, font):
         """
@@ -417,13 +219,12 @@ class Grid:
             y_offset (int): the y position on the screen (in pixels) on which the Grid begins to be drawn.
             width (int): 
         """
-        self.__x_offset = x_offset
-        self.__y_offset = y_offset
-        self.__cellWidth = (width-x_offset)/dim[0]
-        self.__cellHeight = (height-y_offset)/dim[1]
         self.__dim = dim
         self.__cells = []
+        self.__changed = {}    # positions of the Cells changed since get_dirty_rects() was last called, in order
+        self.__texts = {}      # position -> text of the Cells with a text
         self.__font = font
+        self.__renderer = GridRenderer((x_offset, y_offset, width-x_offset, height-y_offset), dim)
 
         for _ in range(dim[0]):
             temp = []
@@ -432,337 +233,105 @@ class Grid:
                 temp.append(cell)
             self.__cells.append(temp)
 
-    def draw(self, screen):
+    def draw(self, screen, area=None):
         """
-        Draws the Grid to the screen.
+        Draws the Grid to the screen (only inside the clip area of the screen).
 
         Parameters:
             screen (pygame.Surface): the surface to be drawn on.
+            area (pygame.Rect): if not None, only the texts of the Cells overlapping this area are drawn. Default=None.
         """
-        for i in range(self.__dim[0]):
-            for j in range(self.__dim[1]):
-                x = self.__x_offset + i*self.__cellWidth
-                y = self.__y_offset + j*self.__cellHeight
-                cell_color = self.__cells[i][j].get_color()
-                cell_text = self.__cells[i][j].get_text()
-                if cell_color:
-                    pygame.draw.rect(screen, self.__cells[i][j].get_color(), [x, y, self.__cellWidth, self.__cellHeight])
-                pygame.draw.rect(screen, gray, [x, y, self.__cellWidth, self.__cellHeight], 1)
-                if cell_text:
-                    cell_text = self.__font.render(cell_text, True, white)
-                    screen.blit(cell_text, cell_text.get_rect(center=(x + self.__cellWidth/2, y + self.__cellHeight/2)))
-
-    def addObject(self, x, y, type, color, text=None):
-        """
-        Add an object to a Cell on the Grid.
-
-        Parameters:
-            x (int): the x position on the Grid.
-            y (int): the y position on the Grid.
-            type (string): the type of the object.
-            color (tuple): RGB color code of the object.
-            text (string): the text to be drawn on top of the Cell. Default=None.
-        """
-        self.__cells[x][y].set_type(type)
-        self.__cells[x][y].set_color(color)
-        self.__cells[x][y].set_text(text)
-
-    def getShape(self):
-        """
-        Returns the shape of the Grid (number of Cell rows, number of Cell columns).
-        """
-        return self.__dim
-
-    def reset(self):
-        """
-        Resets all the Cells (deletes all objects on the Grid).
-        """
-        for i in range(self.__dim[0]):
-            for j in range(self.__dim[1]):
-                self.__cells[i][j].set_type("none")
-                self.__cells[i][j].set_color(None)
-                self.__cells[i][j].set_text(None)
-
-    def checkBounderies(self, pos):
-        """
-        Checks if the position is out of the Grid.
-
-        Parameters:
-            pos (tuple): xy position to be checked.
-        """
-        return True if pos[0] >= self.__dim[0] or pos[0] < 0 or pos[1] >= self.__dim[1] or pos[1] < 0 else False
-
-class Hawk:
-    """
-    The enemy of Snake. It has the ability to spawn Fireballs and spawn Apples in the game.
-    """
-    MAX_HEALTH = 3000
-    def __init__(self, grid_size):
-        """
-        Initializes the Hawk object.
-
-        Parameters:
-            grid_size (tuple): the Shape of the Grid (number of Cell rows, number of Cell columns).
-        """
-        self.__health = Hawk.MAX_HEALTH
-        self.__mobs = []
-        self.__apples = []
-        self.__grid_size = grid_size
-
-    def update(self, dt):
-        """
-        Updates all the Mobs spawned on the Grid.
+        self.__renderer.draw(screen)
+        for (i, j), text in self.__texts.items():
+            rect = self.get_cell_rect(i, j)
+            if area and not area.colliderect(rect):
+                continue
+            text = text_cache.render(self.__font, text, colors.white)
+            screen.blit(text, text.get_rect(center=rect.center))
 
-        Parameters:
-            dt (float): the time between function calls (in seconds).
-        """
-        for m in self.__mobs:
-            if m.is_move(dt):
-                m.update_pos()
-
-    def spawn_fireball(self):
-        """
-        Spawns a Fireball randomly on the Grid.
-        """
-        choice = random.randrange(4)
-        if choice == 0:
-            self.__mobs.append(Fireball(0, random.randrange(self.__grid_size[1]), 1))
-        elif choice == 1:
-            self.__mobs.append(Fireball(self.__grid_size[0]-1, random.randrange(self.__grid_size[1]), -1))
-        elif choice == 2:
-            self.__mobs.append(Fireball(random.randrange(self.__grid_size[0]), 0, 2))
-        elif choice == 3:
-            self.__mobs.append(Fireball(random.randrange(self.__grid_size[0]), self.__grid_size[1]-1, -2))
-
-    def __spawn_apple(self, type, init_time):
-        if type == "apple":
-            return Apple(random.randint(0, self.__grid_size[0]-1), random.randint(0, self.__grid_size[1]-1))
-        if type == "golden_apple":
-            return GoldenApple(random.randint(0, self.__grid_size[0]-1), random.randint(0, self.__grid_size[1]-1), 5, init_time)
-        return PoisonApple(random.randint(0, self.__grid_size[0]-1), random.randint(0, self.__grid_size[1]-1), 5, init_time)
-
-    def spawn_apple(self, type, banned_pos, init_time):
+    def draw_lines(self, surface):
         """
-        Spawns an Apple with a desired type randomly on the Grid.
+        Draws the outline of every Cell (the static part of the Grid).
 
         Parameters:
-            type (string): the type of the Apple (apple, golden_apple, poison_apple).
-            banned_pos (list): a list of xy positions that the Apple cannot be spawned on.
-            init_time (float): the game time at which the function is called.
+            surface (pygame.Surface): the surface to be drawn on.
         """
-        apple = self.__spawn_apple(type, init_time)
-        while apple.get_pos() in banned_pos+[a.get_pos() for a in self.__apples]:
-            apple = self.__spawn_apple(type, init_time)
-        self.__apples.append(apple)
+        self.__renderer.draw_lines(surface)
 
-    def reset_mob(self):
+    def get_dirty_rects(self):
         """
-        Deletes all Mobs on the Grid.
-        """
-        self.__mobs = []
-
-    def heal(self, value):
-        """
-        Heals the Hawk with a specified amount.
-
-        Parameters:
-            value (int): the amount of health to be healed.
+        Returns the list of screen areas (pygame.Rect) of the Cells whose color or text changed since the last call.
         """
-        self.__health = min(self.__health + value, Hawk.MAX_HEALTH)
+        rects = [self.get_cell_rect(i, j) for i, j in self.__changed]
+        self.__changed = {}
+        return rects
 
-    def damage(self, value):
+    def get_cell_rect(self, i, j):
         """
-        Reduces the Hawk's health.
+        Returns the area of the screen (pygame.Rect) covered by a Cell.
 
         Parameters:
-            value (int): the amount of health to be reduced.
+            i (int): the x position on the Grid.
+            j (int): the y position on the Grid.
         """
-        self.__health = max(self.__health - value, 0)
+        # The pixels the GridRenderer paints for the Cell (its width can be fractional, the Rect's cannot)
+        return self.__renderer.get_cell_rect(i, j)
 
-    def is_dead(self):
-        """
-        Returns True if Hawk's health dropped to 0, else False.
-        """
-        return self.__health == 0
-
-    def get_health(self):
-        """
-        Returns Hawk's current health.
-        """
-        return self.__health
-
-    def get_mobs(self):
-        """
-        Returns a list of Mobs currently on the Grid.
-        """
-        return self.__mobs
-
-    def get_apples(self):
-        """
-        Returns a list of Apples currently on the Grid.
-        """
-        return self.__apples
-
-    def get_apple_pos(self):
-        """
-        Returns a list of Apples' xy position currently on the Grid.
-        """
-        return [a.get_pos() for a in self.__apples]
-
-    def get_mob_pos(self):
-        """
-        Returns a list of Mobs' xy position currently on the Grid.
-        """
-        return [m.get_pos() for m in self.__mobs]
-    
-    def remove_mob(self, m):
-        """
-        Removes a specified Mob from the Grid.
-
-        Parameters:
-            m (Mob): the Mob to be removed.
-        """
-        self.__mobs.remove(m)
-
-    def remove_apple(self, a):
-        """
-        Removes a specified Apple from the Grid.
-
-        Parameters:
-            a (Apple): the Apple to be removed.
-        """
-        self.__apples.remove(a)
-
-    def pop_apple(self, index):
+    def addObject(self, x, y, type, color, text=None):
         """
-        Removes an Apple from the Grid with a specified index.
+        Add an object to a Cell on the Grid (the Cell is recorded as changed if it looks different).
 
         Parameters:
-            index (Apple): the index of the Apple to be removed.
-
-        Returns:
-            type (string): the type of the Apple.
+            x (int): the x position on the Grid.
+            y (int): the y position on the Grid.
+            type (string): the type of the object.
+            color (tuple): RGB color code of the object.
+            text (string): the text to be drawn on top of the Cell. Default=None.
         """
-        type = self.__apples[index].get_type()
-        self.__apples.pop(index)
-        return type
-        
+        cell = self.__cells[x][y]
+        if cell.get_color() != (tuple(color) if color else None) or cell.get_text() != text:
+            self.__changed[(x, y)] = True
+        cell.set_type(type)
+        cell.set_color(color)
+        cell.set_text(text)
+        self.__renderer.set_cell(x, y, colors.code(color) if color else -1)
+        if text:
+            self.__texts[(x, y)] = text
+        else:
+            self.__texts.pop((x, y), None)
 
-class Snake(Entity):
-    """
-    The protagonist, inherits the Entity class.
-    """
-    MAX_SPEED = 10
-    def __init__(self, x, y, lives):
+    def removeObject(self, x, y):
         """
-        Initializes the Snake object.
+        Empties a Cell on the Grid.
 
         Parameters:
             x (int): the x position on the Grid.
             y (int): the y position on the Grid.
-            lives (int): the number of lives.
         """
-        super().__init__(x, y, dir=1, color=green, speed=2)
-        self.__snake = [Object(x, y, green, "snake")]
-        self.__lives = lives
+        self.addObject(x, y, "none", None)
 
-    def move(self):
+    def getShape(self):
         """
-        Updates the segments of the Snake.
+        Returns the shape of the Grid (number of Cell rows, number of Cell columns).
         """
-        self.__snake[0].set_color(green)
-        self.__snake.pop()
-        self.__snake.insert(0, Object(self._x, self._y, lime, "snake"))
+        return self.__dim
 
-    def grow(self):
+    def reset(self):
         """
-        Increase the number of Snake's segments by 1.
+        Resets all the Cells (deletes all objects on the Grid).
         """
-        self.__snake[0].set_color(green)
-        self.__snake.insert(0, Object(self._x, self._y, lime, "snake"))
-        self.__update_speed()
+        for i in range(self.__dim[0]):
+            for j in range(self.__dim[1]):
+                self.removeObject(i, j)
 
-    def decay(self, index):
+    def checkBounderies(self, pos):
         """
-        Decreases the Snake's segments from the specified index to the end.
+        Checks if the position is out of the Grid.
 
         Parameters:
-            index (int): the index from which the segments are deleted.
-        """
-        if index == -1:
-            index += len(self.__snake)
-        if index == 0:
-            self.__lives -= 1
-            del self.__snake[1:]
-            self.__update_speed()
-            return len(self.__snake)
-        else:
-            deleted = len(self.__snake) - index
-            del self.__snake[index:]
-            self.__update_speed()
-            return deleted
-
-    def gain_live(self):
-        """
-        Increases Snake's lives by 1.
-        """
-        self.__lives = min(self.__lives + 1, 3)
-
-    def lose_live(self):
-        """
-        Decreases Snake's lives by 1.
-        """
-        self.__lives -= 1
-
-    def self_collide(self):
-        """
-        Returns True if the position of the first segment is the same with the position of any of other segments, else False.
-        """
-        index = self.collide(self.get_segments_pos()[1:-1])
-        if index != -1:
-            self.decay(index+1)
-            self.move()
-            return True
-        return False
-
-    def is_dead(self):
-        """
-        Returns True if the number of Snake's lives is 0, else False.
-        """
-        return self.__lives == 0
-
-    def __update_speed(self):
-        self._speed = min(2*(len(self.__snake)//5) + 2, Snake.MAX_SPEED)
-
-    def getSegments(self):
-        """
-        Returns a list of Snake's segments.
-        """
-        return self.__snake
-
-    def getDirection(self):
-        """
-        Returns the current direction of the Snake.
-        """
-        return self._direction
-
-    def get_segments_pos(self):
-        """
-        Returns a list of positions of the Snake's segments.
-        """
-        return [(s._x, s._y) for s in self.__snake]
-
-    def get_head(self):
-        """
-        Returns the position of the first segment.
-        """
-        return self._x, self._y
-
-    def get_lives(self):
-        """
-        Returns the number of lives.
+            pos (tuple): xy position to be checked.
         """
-        return self.__lives
+        return True if pos[0] >= self.__dim[0] or pos[0] < 0 or pos[1] >= self.__dim[1] or pos[1] < 0 else False
 
 # pygame setup
 pygame.init()
@@ -770,38 +339,97 @@ WIDTH, HEIGHT = int(config["width"]), int(config["height"])
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("SnakeSoul")
 clock = pygame.time.Clock()
+fonts = FontRegistry()
+text_cache = TextCache()
+blur_cache = BlurCache()
+menu_backgrounds = []
+assets = AssetManager(asset_path, audio_path)
+audio = AudioBank(assets, audio_path, audio_config.get("voices", 8))
+
+# Files used by play() and the screens after it, decoded in the background while the main menu is shown
+PLAY_IMAGES = ["day_sky.jpg", "night_sky.jpg", "grass.jpg", "grass2.jpg", "hawk.png", "full_heart.png", "empty_heart.png"]
+PLAY_SOUNDS = ["click.mp3", "enemy_chaser.mp3", "damage.mp3", "coin.mp3", "victory.mp3", "oof.mp3"] + [f"footstep{i}.mp3" for i in range(1, 5)]
+
+# Effect played for each game event: (file name, priority)
+EVENT_SOUNDS = {"fireball": ("enemy_chaser.mp3", 1), "coin": ("coin.mp3", 2), "damage": ("damage.mp3", 2)}
 
 def timer(t):
     min = t//60
     sec = t%60
     return f"{(min//10)%10}{min%10}:{(sec//10)%10}{sec%10}"
 
-def gaussian_blur(surface, radius):
-    scaled_surface = pygame.transform.smoothscale(surface, (surface.get_width() // radius, surface.get_height() // radius))
-    scaled_surface = pygame.transform.smoothscale(scaled_surface, (surface.get_width(), surface.get_height()))
-    return scaled_surface
+def get_cell_content(state, pos, game_time):
+    """
+    Returns (type, color, text) of what is drawn in a Cell: a Mob over an Apple over the Snake, or an empty Cell.
+
+    Parameters:
+        state (GameState): the GameState of the game.
+        pos (tuple): xy position on the Grid.
+        game_time (float): the game time (in seconds) used for the countdowns of the Apples.
+    """
+    occupancy = state.occupancy
+    if occupancy.has(Occupancy.MOB, pos):
+        mobs = state.hawk.get_mobs()
+        type, color, _ = mobs.get_cell(mobs.find(pos))
+        return type, color, None
+    if occupancy.has(Occupancy.APPLE, pos):
+        apples = state.hawk.get_apples()
+        return apples.get_cell(apples.find(pos), game_time)
+    if occupancy.has(Occupancy.SNAKE, pos):
+        # The head is only visible if no other segment is on its Cell
+        is_head = pos == state.snake.get_head() and occupancy.count(Occupancy.SNAKE, pos) == 1
+        return "snake", state.snake.get_segment_color(0 if is_head else 1), None
+    return "none", None, None
+
+def get_menu_backgrounds():
+    """
+    Returns the list of menu background images. They are loaded and their blurred versions computed the first time only.
+    """
+    if not menu_backgrounds:
+        for i in range(1, 4):
+            bg = assets.image(f"bg{i}.jpg", (WIDTH, HEIGHT))
+            blur_cache.get(bg, 5)
+            menu_backgrounds.append(bg)
+    return menu_backgrounds
+
+def save_replay(replay):
+    """
+    Writes the Replay of a game in the replay directory of config.yml (nothing is written if it is not set).
+
+    Parameters:
+        replay (Replay): the Replay of the game.
+    """
+    directory = config.get("replay", {}).get("directory")
+    if not directory or not replay.get_ticks():
+        return
+    os.makedirs(directory, exist_ok=True)
+    replay.save(os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.get_seed()}.ssr"))
+
+def compose_background(sky, ground, grid, sprites):
+    """
+    Returns a display-format Surface with everything that does not change during a day/night phase: the sky, the ground, the Grid lines and the static sprites.
+
+    Parameters:
+        sky (pygame.Surface): the image of the sky (top 360 pixels).
+        ground (pygame.Surface): the image of the ground (below the sky).
+        grid (Grid): the Grid whose lines are drawn.
+        sprites (list): (pygame.Surface, position) pairs blitted on top, in order.
+    """
+    background = pygame.Surface((WIDTH, HEIGHT)).convert()
+    background.blit(sky, (0, 0))
+    background.blit(ground, (0, 360))
+    grid.draw_lines(background)
+    for sprite, pos in sprites:
+        background.blit(sprite, pos)
+    return background
 
 def get_font(size): # Returns Press-Start-2P in the desired size
-    return pygame.font.Font(os.path.join(asset_path, "vinque.otf"), size)
+    return fonts.get(os.path.join(asset_path, "vinque.otf"), size)
 
 def display_text(surface, text, pos, font, color):
-    collection = [word.split(' ') for word in text.splitlines()]
-    space = font.size(' ')[0]
-    x,y = pos
-    for lines in collection:
-        for words in lines:
-            word_surface = font.render(words, True, color)
-            word_width , word_height = word_surface.get_size()
-            if x + word_width >= WIDTH:
-                x = pos[0]
-                y += word_height
-            surface.blit(word_surface, (x,y))
-            x += word_width + space
-        x = pos[0]
-        y += word_height
+    surface.blit(text_cache.paragraph(font, text, color, WIDTH - pos[0]), pos)
 
 def tutorial():
-    click_sound = mixer.Sound(os.path.join(audio_path, "click.mp3"))
 
     TUTORIAL_TEXT = "Welcome to SnakeSoul!\n\n"\
                     "Your goal is to defeat the Magic Hawk before it defeats you!\n\n"\
@@ -817,251 +445,188 @@ def tutorial():
                     "If you are out of lives, the game will be over.\n"
     font = get_font(30)
 
-    QUIT_BUTTON = Button(pos=(WIDTH//2, 1000), text_input="MAIN MENU", font=get_font(75), base_color=white, hovering_color=gray)
+    QUIT_BUTTON = Button(pos=(WIDTH//2, 1000), text_input="MAIN MENU", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
     
-    instruction = 3
-    running = True
-    while running:
-        screen.fill(black)
-
-        display_text(screen, TUTORIAL_TEXT, (20, 20), font, white)
-
-        MENU_MOUSE_POS = pygame.mouse.get_pos()
-
-        QUIT_BUTTON.changeColor(MENU_MOUSE_POS)
-        QUIT_BUTTON.update(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if QUIT_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = 0
-                    running = False
+    def draw(screen):
+        screen.fill(colors.black)
+        display_text(screen, TUTORIAL_TEXT, (20, 20), font, colors.white)
 
-        pygame.display.update()
+    def on_click(button):
+        audio.play("click.mp3", 3)
+        return 0
 
-    return instruction
+    return Scene(draw, [QUIT_BUTTON]).run(screen, on_click)
 
 
 
 def victory(game_time):
-    click_sound = mixer.Sound(os.path.join(audio_path, "click.mp3"))
-    victory_sound = mixer.Sound(os.path.join(audio_path, "victory.mp3"))
+    # Snapshot of the last frame of the game, blurred once and shown behind the menu
+    bg = freeze_frame(screen)
 
-    mixer.Channel(0).play(victory_sound)
+    audio.stop_music()
+    audio.play("victory.mp3", 4, volume=1)
 
-    MENU_TEXT = get_font(75).render("VICTORY", True, dark_yellow)
+    MENU_TEXT = get_font(75).render("VICTORY", True, colors.dark_yellow)
     MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 400))
 
-    TIME_TEXT = get_font(50).render(f"Time taken: {game_time}", True, white)
+    TIME_TEXT = get_font(50).render(f"Time taken: {game_time}", True, colors.white)
     TIME_RECT = TIME_TEXT.get_rect(center=(WIDTH//2, 600))
 
-    QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="MAIN MENU", font=get_font(75), base_color=white, hovering_color=dark_green)
-
-    instruction = 2
-    running = True
-    while running:
-        screen.fill(black)
-
-        MENU_MOUSE_POS = pygame.mouse.get_pos()
+    QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="MAIN MENU", font=get_font(75), base_color=colors.white, hovering_color=colors.dark_green)
 
+    def draw(screen):
+        screen.blit(bg, (0, 0))
         screen.blit(MENU_TEXT, MENU_RECT)
         screen.blit(TIME_TEXT, TIME_RECT)
 
-        QUIT_BUTTON.changeColor(MENU_MOUSE_POS)
-        QUIT_BUTTON.update(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if QUIT_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(0).play(click_sound)
-                    instruction = 0
-                    running = False
-        pygame.display.update()
+    def on_click(button):
+        audio.play("click.mp3", 3, volume=1)
+        return 0
 
-    return instruction
+    return Scene(draw, [QUIT_BUTTON]).run(screen, on_click)
 
 def game_over():
-    click_sound = mixer.Sound(os.path.join(audio_path, "click.mp3"))
-    oof = mixer.Sound(os.path.join(audio_path, "oof.mp3"))
-    
-    mixer.Channel(0).play(oof)
+    # Snapshot of the last frame of the game, blurred once and shown behind the menu
+    bg = freeze_frame(screen)
 
-    MENU_TEXT = get_font(80).render("GAME OVER", True, dark_yellow)
-    MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 400))
-
-    QUIT_BUTTON = Button(pos=(WIDTH//2, 600), text_input="MAIN MENU", font=get_font(75), base_color=white, hovering_color=dark_green)
+    audio.stop_music()
+    audio.play("oof.mp3", 4, volume=1)
 
-    instruction = 2
-    running = True
-    while running:
-        screen.fill(black)
+    MENU_TEXT = get_font(80).render("GAME OVER", True, colors.dark_yellow)
+    MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 400))
 
-        MENU_MOUSE_POS = pygame.mouse.get_pos()
+    QUIT_BUTTON = Button(pos=(WIDTH//2, 600), text_input="MAIN MENU", font=get_font(75), base_color=colors.white, hovering_color=colors.dark_green)
 
+    def draw(screen):
+        screen.blit(bg, (0, 0))
         screen.blit(MENU_TEXT, MENU_RECT)
 
-        QUIT_BUTTON.changeColor(MENU_MOUSE_POS)
-        QUIT_BUTTON.update(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if QUIT_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = 0
-                    running = False
-        pygame.display.update()
+    def on_click(button):
+        audio.play("click.mp3", 3)
+        return 0
 
-    return instruction
+    return Scene(draw, [QUIT_BUTTON]).run(screen, on_click)
 
 def pause():
-    click_sound = mixer.Sound(os.path.join(audio_path, "click.mp3"))
+    # Snapshot of the last frame of the game, blurred once and shown behind the menu
+    bg = freeze_frame(screen)
 
-    mixer.Channel(0).pause()
-    mixer.Channel(1).play(click_sound)
-
-    MENU_TEXT = get_font(80).render("SnakeSoul", True, dark_yellow)
-    MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 400))
 
-    RESUME_BUTTON = Button(pos=(WIDTH//2, 600), text_input="RESUME", font=get_font(75), base_color=white, hovering_color=gray)
-    QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="MAIN MENU", font=get_font(75), base_color=white, hovering_color=gray)
+    audio.pause_music()
+    audio.play("click.mp3", 3)
 
-    instruction = 0
-    running = True
-    while running:
-        screen.fill(black)
+    MENU_TEXT = get_font(80).render("SnakeSoul", True, colors.dark_yellow)
+    MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 400))
 
-        MENU_MOUSE_POS = pygame.mouse.get_pos()
+    RESUME_BUTTON = Button(pos=(WIDTH//2, 600), text_input="RESUME", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
+    QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="MAIN MENU", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
 
+    def draw(screen):
+        screen.blit(bg, (0, 0))
         screen.blit(MENU_TEXT, MENU_RECT)
 
-        for button in [RESUME_BUTTON, QUIT_BUTTON]:
-            button.changeColor(MENU_MOUSE_POS)
-            button.update(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if RESUME_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    mixer.Channel(0).unpause()
-                    instruction = 0
-                    running = False
-                if QUIT_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = 1
-                    running = False
-        pygame.display.update()
+    def on_click(button):
+        audio.play("click.mp3", 3)
+        if button is RESUME_BUTTON:
+            audio.unpause_music()
+            return 0
+        return 1
 
-    return instruction
+    return Scene(draw, [RESUME_BUTTON, QUIT_BUTTON]).run(screen, on_click)
 
 def menu():
-    bg_music = mixer.Sound(os.path.join(audio_path, "dark_soul.mp3"))
-    click_sound = mixer.Sound(os.path.join(audio_path, "click.mp3"))
-    
-    mixer.Channel(0).play(bg_music, loops=-1)
+    assets.preload(PLAY_IMAGES)
+    audio.preload(PLAY_SOUNDS)
+    audio.play_music("dark_soul.mp3")
     
 
 
-    img_file = f"bg{random.randint(1,3)}.jpg"
-    bg = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, img_file)), (WIDTH, HEIGHT))
-
-    instruction = 0
-    running = True
-    while running:
-        screen.fill(black)
-
-        MENU_MOUSE_POS = pygame.mouse.get_pos()
+    bg = get_menu_backgrounds()[random.randint(1,3)-1]
 
-        MENU_TEXT = get_font(80).render("SnakeSoul", True, dark_yellow)
-        MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 200))
+    MENU_TEXT = get_font(80).render("SnakeSoul", True, colors.dark_yellow)
+    MENU_RECT = MENU_TEXT.get_rect(center=(WIDTH//2, 200))
 
-        PLAY_BUTTON = Button(pos=(WIDTH//2, 400), text_input="PLAY", font=get_font(75), base_color=white, hovering_color=gray)
-        OPTIONS_BUTTON = Button(pos=(WIDTH//2, 600), text_input="TUTORIAL", font=get_font(75), base_color=white, hovering_color=gray)
-        QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="QUIT", font=get_font(75), base_color=white, hovering_color=gray)
+    PLAY_BUTTON = Button(pos=(WIDTH//2, 400), text_input="PLAY", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
+    OPTIONS_BUTTON = Button(pos=(WIDTH//2, 600), text_input="TUTORIAL", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
+    QUIT_BUTTON = Button(pos=(WIDTH//2, 800), text_input="QUIT", font=get_font(75), base_color=colors.white, hovering_color=colors.gray)
 
-        screen.blit(gaussian_blur(bg, 5), (0, 0))
+    def draw(screen):
+        screen.blit(blur_cache.get(bg, 5), (0, 0))
         screen.blit(MENU_TEXT, MENU_RECT)
 
-        for button in [PLAY_BUTTON, OPTIONS_BUTTON, QUIT_BUTTON]:
-            button.changeColor(MENU_MOUSE_POS)
-            button.update(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if PLAY_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = 1
-                    running = False
-                if OPTIONS_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = 3
-                    running = False
-                if QUIT_BUTTON.checkForInput(MENU_MOUSE_POS):
-                    mixer.Channel(1).play(click_sound)
-                    instruction = -1
-                    running = False
-        pygame.display.update()
-    return instruction
+    def on_click(button):
+        audio.play("click.mp3", 3)
+        if button is PLAY_BUTTON:
+            return 1
+        if button is OPTIONS_BUTTON:
+            return 3
+        return -1
+
+    return Scene(draw, [PLAY_BUTTON, OPTIONS_BUTTON, QUIT_BUTTON]).run(screen, on_click)
 
 
 def play():
     fs_index = 1
     
-    bg_music = mixer.Sound(os.path.join(audio_path, "c418.mp3"))
-    fireball = mixer.Sound(os.path.join(audio_path, "enemy_chaser.mp3"))
-    damage = mixer.Sound(os.path.join(audio_path, "damage.mp3"))
-    coin = mixer.Sound(os.path.join(audio_path, "coin.mp3"))
-
-    mixer.Channel(0).play(bg_music, loops=-1)
+    audio.play_music("c418.mp3")
 
+    simulation_config = config.get("simulation", {})
+    fps = simulation_config.get("fps", 60)
+    timestep = FixedTimestep(simulation_config.get("tick_rate", 60), simulation_config.get("max_ticks", 5))
     dt = 0
-    prev_game_time = 0
-    game_time = 0
-    updated_time = 0
-    clock.tick(60)
-
-    DAYTIME = 60
-    is_day = True
+    clock.tick(fps)
 
-    day = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "day_sky.jpg")), (WIDTH, 360))
-    night = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "night_sky.jpg")), (WIDTH, 360))
-    grass = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "grass.jpg")), (WIDTH, HEIGHT-360))
-    grass2 = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "grass2.jpg")), (WIDTH, HEIGHT-360))
-    hawk_img = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "hawk.png")).convert_alpha(), (200, 210))
-    full_heart = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "full_heart.png")).convert_alpha(), (50, 50))
-    empty_heart = pygame.transform.scale(pygame.image.load(os.path.join(asset_path, "empty_heart.png")).convert_alpha(), (50, 50))
+    day = assets.image("day_sky.jpg", (WIDTH, 360))
+    night = assets.image("night_sky.jpg", (WIDTH, 360))
+    grass = assets.image("grass.jpg", (WIDTH, HEIGHT-360))
+    grass2 = assets.image("grass2.jpg", (WIDTH, HEIGHT-360))
+    hawk_img = assets.image("hawk.png", (200, 210), alpha=True)
+    full_heart = assets.image("full_heart.png", (50, 50), alpha=True)
+    empty_heart = assets.image("empty_heart.png", (50, 50), alpha=True)
 
 
     font = get_font(60)
-    game_title = font.render("SnakeSoul", True, dark_yellow)
+    game_title = font.render("SnakeSoul", True, colors.dark_yellow)
     title_rect = game_title.get_rect(center=(150, 50))
 
-    SHAPE = [18, 18]
-    grid = Grid(0, 360, WIDTH, HEIGHT, SHAPE, get_font(30))
+    # The Grid shows the Camera's view of the world: only the visible Cells are kept, updated and drawn
+    board_config = config.get("board", {})
+    SHAPE = tuple(board_config.get("shape", (18, 18)))
+    camera = Camera(SHAPE, board_config.get("view", SHAPE))
+    grid = Grid(0, 360, WIDTH, HEIGHT, camera.get_view_shape(), get_font(30))
 
-    snake = Snake(SHAPE[0]//2, SHAPE[1]//2, 3)
-    dir = snake.getDirection()
-    isDirUpdated = False
-
-    hawk = Hawk(grid.getShape())
-    hawk.spawn_apple("apple", snake.get_segments_pos(), game_time)
+    engine = Engine(SHAPE)
+    state = engine.reset()
+    camera.center(state.snake.get_head())
+    replay = Replay(state.seed, SHAPE, tick_rate=simulation_config.get("tick_rate", 60))
     
-    health_bar = Bar(200, 300, 500, 30, red, gray, hawk.MAX_HEALTH)
+    health_bar = Bar(200, 300, 500, 30, colors.red, colors.gray, state.hawk.MAX_HEALTH)
+    hearts_rect = pygame.Rect(WIDTH-20-50*3, 100, 50*3, 50)
+    # A world larger than the view gets a map of the whole world above the end of the health Bar
+    minimap = None
+    if camera.get_view_shape() != SHAPE:
+        minimap = Minimap(pygame.Rect(health_bar.get_rect().right-120, 170, 120, 120), SHAPE, board_config.get("minimap_period", 0.5))
+
+    # Static layer of each day/night phase, composed the first time the phase is shown
+    backgrounds = {}
+
+    def draw_scene():
+        screen.blit(backgrounds[state.is_day], (0, 0))
+        grid.draw(screen, screen.get_clip())
+        screen.blit(timer_str, timer_rect)
+
+        health_bar.draw(screen)
+        if minimap:
+            minimap.draw(screen)
+
+        for i in range(3, 0, -1):
+            screen.blit((full_heart if i <= state.snake.get_lives() else empty_heart), (WIDTH-20-50*i, 100))
+
+    # What is currently on the screen, to only repaint the parts that changed
+    full_redraw = True
+    drawn_is_day = drawn_timer = drawn_health = drawn_lives = drawn_head = drawn_second = None
+    visible_changed = True    # whether the Camera showed another part of the world since the last frame
+    timer_str = timer_rect = None
 
     instruction = 1
     while True:
@@ -1079,144 +644,113 @@ def play():
             if response:
                 instruction = 0
                 break
-            clock.tick(60)
-
-        if not isDirUpdated:
-            newDir = dir
-            if keys[pygame.K_w]:
-                newDir = -2
-            elif keys[pygame.K_s]:
-                newDir = 2
-            elif keys[pygame.K_a]:
-                newDir = -1
-            elif keys[pygame.K_d]:
-                newDir = 1
-            if newDir != dir:
-                isDirUpdated = True
-                dir = newDir
-
-        # Day-time switch
-        if int(game_time) % DAYTIME == 0 and updated_time:
-            is_day = not is_day
-
-        # Game events
-        if updated_time:
-            if is_day:
-                if game_time >= 15 and int(game_time) % 15 in range(5):
-                    mixer.Channel(1).play(fireball)
-                    hawk.spawn_fireball()
-                if game_time >= 30 and int(game_time) % 30 == 0:
-                    hawk.spawn_apple("golden_apple", snake.get_segments_pos(), game_time)
-            else:
-                if game_time >= 15 and int(game_time) % 15 in range(10):
-                    mixer.Channel(1).play(fireball)
-                    hawk.spawn_fireball()
-            if game_time >= 20 and int(game_time) % 20 in range(10):
-                hawk.spawn_apple("poison_apple", snake.get_segments_pos(), game_time)
-            for apple in hawk.get_apples():
-                if apple.get_type() in ["golden_apple", "poison_apple"]:
-                    if apple.is_timeup(game_time):
-                        hawk.remove_apple(apple)
-
-        # Snake movement
-        if snake.is_move(dt):
-            mixer.Channel(2).play(mixer.Sound(os.path.join(audio_path, f"footstep{fs_index}.mp3")))
-            fs_index += 1
-            if fs_index > 4:
-                fs_index = 1
-            snake.update_pos(dir)
-            index = snake.collide(hawk.get_apple_pos())
-            if index != -1:
-                type = hawk.pop_apple(index)
-                if type == "apple":
-                    mixer.Channel(4).play(coin)
-                    snake.grow()
-                    hawk.damage(100)
-                    hawk.spawn_apple("apple", snake.get_segments_pos(), game_time)
-                elif type == "golden_apple":
-                    mixer.Channel(4).play(coin)
-                    snake.gain_live()
-                    hawk.damage(500)
-                    snake.move()
-                else:
-                    mixer.Channel(3).play(damage)
-                    hawk.heal(20)
-                    snake.decay(-1)
-                    snake.move()
-            elif grid.checkBounderies(snake.get_head()):
-                snake = Snake(SHAPE[0]//2, SHAPE[1]//2, snake.get_lives()-1)
-                hawk.reset_mob()
-            elif snake.self_collide():
-                snake.lose_live()
-            else:
-                snake.move()
-            isDirUpdated = False
-
-
-        # Mobs movement
-        hawk.update(dt)
-        for mob in hawk.get_mobs():
-            if grid.checkBounderies(mob.get_pos()):
-                hawk.remove_mob(mob)
-            index = mob.collide(snake.get_segments_pos())
-            if index != -1:
-                mixer.Channel(3).play(damage)
-                l = snake.decay(index)
-                hawk.heal(50*l)
-                hawk.remove_mob(mob)
+            full_redraw = True
+            clock.tick(fps)
+            timestep.reset()
+
+        action = None
+        if keys[pygame.K_w]:
+            action = -2
+        elif keys[pygame.K_s]:
+            action = 2
+        elif keys[pygame.K_a]:
+            action = -1
+        elif keys[pygame.K_d]:
+            action = 1
+
+        # Game rules
+        for _ in range(timestep.advance(dt)):
+            if state.is_over():
+                break
+            game_events = engine.step(action, timestep.get_step())
+            replay.record(action, state)
+            for game_event in game_events:
+                if game_event == "footstep":
+                    audio.play(f"footstep{fs_index}.mp3")
+                    fs_index += 1
+                    if fs_index > 4:
+                        fs_index = 1
+                elif game_event in EVENT_SOUNDS:
+                    audio.play(*EVENT_SOUNDS[game_event])
+        snake = state.snake
+        hawk = state.hawk
+        # Rendering stays quantized to whole Cells: the Snake and the Mobs are drawn in the Cell they are in, not
+        # between Cells. Only the time shown (timer, Apple countdowns) counts the part of a tick left in the accumulator.
+        game_time = state.game_time + timestep.get_alpha()*timestep.get_step()
 
         # End game
-        if snake.is_dead():
+        if state.result == "game_over":
             instruction = 2
             break
-        if hawk.is_dead():
+        if state.result == "victory":
             victory(timer(int(game_time)))
             instruction = 0
             break
 
-        # Adding to grid
-        grid.reset()
-        for s in snake.getSegments():
-            grid.addObject(s.get_x(), s.get_y(), s.get_type(), s.get_color())
-        for a in hawk.get_apples():
-            grid.addObject(a.get_x(), a.get_y(), a.get_type(), a.get_color(), a.get_time(game_time))
-        for mob in hawk.get_mobs():
-            grid.addObject(mob.get_x(), mob.get_y(), mob.get_type(), mob.get_color())
+        # Updating the Grid: only the Cells changed since the last frame are recomputed, plus the old and new Cell of
+        # the head (the head is drawn brighter) and, every second, the Cells of the Apples with a countdown.
+        # When the Camera scrolls, every visible Cell is recomputed and the whole screen is redrawn instead.
+        changed = state.occupancy.pop_changes()
+        if camera.follow(snake.get_head()) or visible_changed:
+            changed = camera.get_visible()
+            visible_changed = False
+            full_redraw = True
+        if snake.get_head() != drawn_head:
+            if drawn_head:
+                changed.append(drawn_head)
+            drawn_head = snake.get_head()
+            changed.append(drawn_head)
+        if int(game_time) != drawn_second:
+            drawn_second = int(game_time)
+            changed += [(x, y) for x, y, _, _, text in hawk.get_apples().get_cells(game_time) if text]
+        for pos in changed:
+            view_pos = camera.to_view(pos)
+            if view_pos:
+                grid.addObject(*view_pos, *get_cell_content(state, pos, game_time))
 
         # Updating UI
-        timer_str = font.render(timer(int(game_time)), True, white)
-        timer_rect = timer_str.get_rect(center=(WIDTH-100, 50))
-
-        health_bar.set_val(hawk.get_health())
+        dirty = grid.get_dirty_rects()
+        if state.is_day != drawn_is_day:
+            drawn_is_day = state.is_day
+            if state.is_day not in backgrounds:
+                sky, ground = (day, grass) if state.is_day else (night, grass2)
+                backgrounds[state.is_day] = compose_background(sky, ground, grid, [(game_title, title_rect), (hawk_img, (0, 160))])
+            full_redraw = True
+        if timer(int(game_time)) != drawn_timer:
+            drawn_timer = timer(int(game_time))
+            timer_str = text_cache.render(font, drawn_timer, colors.white)
+            new_rect = timer_str.get_rect(center=(WIDTH-100, 50))
+            dirty.append(new_rect.union(timer_rect) if timer_rect else new_rect)
+            timer_rect = new_rect
+        if hawk.get_health() != drawn_health:
+            drawn_health = hawk.get_health()
+            health_bar.set_val(drawn_health)
+            dirty.append(health_bar.get_rect())
+        if snake.get_lives() != drawn_lives:
+            drawn_lives = snake.get_lives()
+            dirty.append(hearts_rect)
+        if minimap and minimap.update(state.occupancy, game_time, pygame.Rect(camera.get_offset(), camera.get_view_shape())):
+            dirty.append(minimap.get_rect())
 
         # Drawing
-        screen.fill(black)
-        if is_day:
-            screen.blit(day, (0, 0))
-            screen.blit(grass, (0, 360))
-        else:
-            screen.blit(night, (0, 0))
-            screen.blit(grass2, (0, 360))
-        grid.draw(screen)
-        screen.blit(game_title, title_rect)
-        screen.blit(timer_str, timer_rect)
-        screen.blit(hawk_img, (0, 160))
-
-        health_bar.draw(screen)
-
-        for i in range(3, 0, -1):
-            screen.blit((full_heart if i <= snake.get_lives() else empty_heart), (WIDTH-20-50*i, 100))
-
-        # flip() the display to put your work on screen
-        pygame.display.flip()
-
-        # limits FPS to 60
-        # dt is delta time in seconds since last frame, used for framerate-independent physics.
-        dt = clock.tick(60) / 1000
-        game_time += dt
-        updated_time = int(game_time) - int(prev_game_time)
-        prev_game_time = game_time
-
+        if full_redraw:
+            draw_scene()
+            # flip() the display to put your work on screen
+            pygame.display.flip()
+            full_redraw = False
+        elif dirty:
+            # Only the changed areas are repainted (everything is clipped to them) and sent to the display
+            for rect in dirty:
+                screen.set_clip(rect)
+                draw_scene()
+            screen.set_clip(None)
+            pygame.display.update(dirty)
+
+        # limits FPS
+        # dt is delta time in seconds since last frame, turned into fixed simulation ticks at the start of the next frame.
+        dt = clock.tick(fps) / 1000
+
+    save_replay(replay)
     return instruction
 
 def main():
@@ -1231,5 +765,3 @@ def main():
         elif instruction == 3:
             instruction = tutorial()
     pygame.quit()
-
-main()
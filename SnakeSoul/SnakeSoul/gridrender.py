@@ -0,0 +1,104 @@
+import numpy as np
+import pygame
+from . import colors
+
+class GridRenderer:
+    """
+    Draws the colors of the Cells of a Grid with a few C-level calls whatever the size of the Grid.
+    The Grid is kept as a uint8 array of palette indexes (one per Cell). The pixels of the area to be drawn are looked up
+    in it with NumPy, through the Cell of every pixel column and row, written into an 8-bit Surface with
+    surfarray, and covered by an overlay of the Cell outlines drawn once. Cell i covers the pixels int(i*width) to
+    int((i+1)*width) (also when the Cells have a fractional width), whichever part of the Grid is drawn, so repainting
+    a few dirty Cells gives the same pixels as a full redraw and stays cheap.
+    """
+    TRANSPARENT = (255, 0, 255)    # color of palette index 0 (empty Cell, see-through), it must not be in colors.PALETTE
+    def __init__(self, rect, shape, line_color=colors.gray):
+        """
+        Initializes the GridRenderer object. The display must already be initialized.
+
+        Parameters:
+            rect (pygame.Rect): the area of the screen covered by the Grid.
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns).
+            line_color (tuple): RGB color code of the Cell outlines. Default=gray.
+        """
+        self.__rect = pygame.Rect(rect)
+        self.__shape = tuple(shape)
+        self.__indexes = np.zeros(self.__shape, np.uint8)    # color code + 1 of every Cell, 0 if it is empty
+        self.__pixels = pygame.Surface(self.__rect.size, depth=8)
+        self.__pixels.set_colorkey(0)
+        self.__palette_size = 0
+        self.__update_palette()
+        self.__cell_width = self.__rect.width/self.__shape[0]
+        self.__cell_height = self.__rect.height/self.__shape[1]
+        # Cell of every pixel column and row of the area, and the pixel edges of the Cells
+        self.__edges_x = [int(i*self.__cell_width) for i in range(self.__shape[0] + 1)]
+        self.__edges_y = [int(j*self.__cell_height) for j in range(self.__shape[1] + 1)]
+        self.__cell_x = np.repeat(np.arange(self.__shape[0]), np.diff(self.__edges_x))
+        self.__cell_y = np.repeat(np.arange(self.__shape[1]), np.diff(self.__edges_y))
+        # The outlines are kept in the display format (with a run-length encoded colorkey) to be blitted without conversion
+        self.__lines = pygame.Surface(self.__rect.size).convert()
+        self.__lines.fill(GridRenderer.TRANSPARENT)
+        for i in range(self.__shape[0]):
+            for j in range(self.__shape[1]):
+                pygame.draw.rect(self.__lines, line_color, self.get_cell_rect(i, j).move(-self.__rect.left, -self.__rect.top), 1)
+        self.__lines.set_colorkey(GridRenderer.TRANSPARENT, pygame.RLEACCEL)
+
+    def set_cell(self, x, y, code):
+        """
+        Changes the color of a Cell.
+
+        Parameters:
+            x (int): the x position on the Grid.
+            y (int): the y position on the Grid.
+            code (int): the color code of the Cell (see colors.PALETTE), -1 if it is empty.
+        """
+        self.__indexes[x, y] = code + 1
+
+    def draw(self, screen):
+        """
+        Draws the colored Cells and the outline of every Cell on a Surface (only inside its clip area).
+
+        Parameters:
+            screen (pygame.Surface): the surface to be drawn on.
+        """
+        area = screen.get_clip().clip(self.__rect)
+        if not area:
+            return
+        if len(colors.PALETTE) != self.__palette_size:
+            self.__update_palette()
+        # The pixels of the area (relative to the Grid), each one with the color of its Cell
+        local = area.move(-self.__rect.left, -self.__rect.top)
+        columns = self.__cell_x[local.left:local.right]
+        rows = self.__cell_y[local.top:local.bottom]
+        pixels = pygame.surfarray.pixels2d(self.__pixels)
+        pixels[local.left:local.right, local.top:local.bottom] = self.__indexes.take(columns, 0).take(rows, 1)
+        del pixels    # unlocks the Surface
+        screen.blit(self.__pixels, area.topleft, local)
+        screen.blit(self.__lines, self.__rect.topleft)
+
+    def get_cell_rect(self, i, j):
+        """
+        Returns the area of the screen (pygame.Rect) covered by a Cell.
+
+        Parameters:
+            i (int): the x position on the Grid.
+            j (int): the y position on the Grid.
+        """
+        left, top = self.__edges_x[i], self.__edges_y[j]
+        return pygame.Rect(self.__rect.left + left, self.__rect.top + top, self.__edges_x[i+1] - left, self.__edges_y[j+1] - top)
+
+    def draw_lines(self, surface):
+        """
+        Draws the outline of every Cell (the static part of the Grid).
+
+        Parameters:
+            surface (pygame.Surface): the surface to be drawn on.
+        """
+        surface.blit(self.__lines, self.__rect.topleft)
+
+    def __update_palette(self):
+        # Palette index 0 is the see-through color, then every color of colors.PALETTE (new colors can be added at any time)
+        palette = [GridRenderer.TRANSPARENT] + colors.PALETTE
+        palette += [(0, 0, 0)]*(256 - len(palette))
+        self.__pixels.set_palette(palette)
+        self.__palette_size = len(colors.PALETTE)
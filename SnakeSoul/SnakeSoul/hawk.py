@@ -0,0 +1,208 @@
+import random
+import numpy as np
+from .occupancy import Occupancy
+from .store import EntityStore
+
+class Hawk:
+    """
+    The enemy of Snake. It has the ability to spawn Fireballs and spawn Apples in the game.
+    The Mobs and the Apples are rows of two EntityStores, so they are moved, tested and removed in bulk.
+    """
+    MAX_HEALTH = 3000
+    def __init__(self, grid_size, rng=None, occupancy=None):
+        """
+        Initializes the Hawk object.
+
+        Parameters:
+            grid_size (tuple): the Shape of the Grid (number of Cell rows, number of Cell columns).
+            rng (random.Random): the random number generator used for spawning. If None, the global random module is used. Default=None.
+            occupancy (Occupancy): the Occupancy index kept up to date with the Apples and Mobs. Default=None.
+        """
+        self.__health = Hawk.MAX_HEALTH
+        self.__mobs = EntityStore()
+        self.__apples = EntityStore()
+        self.__grid_size = grid_size
+        self.__rng = rng if rng else random
+        self.__occupancy = occupancy
+
+    def update(self, dt):
+        """
+        Updates all the Mobs spawned on the Grid, and returns the number of Mobs that moved.
+
+        Parameters:
+            dt (float): the time between function calls (in seconds).
+        """
+        moved = self.__mobs.move(dt)
+        if self.__occupancy and len(moved):
+            xs = self.__mobs.get_column("x")[moved].tolist()
+            ys = self.__mobs.get_column("y")[moved].tolist()
+            steps = (self.__mobs.get_column("direction")[moved] + 2).tolist()
+            for x, y, step in zip(xs, ys, steps):
+                old_pos = (x - int(EntityStore.STEP_X[step]), y - int(EntityStore.STEP_Y[step]))
+                self.__occupancy.move(Occupancy.MOB, old_pos, (x, y))
+        return len(moved)
+
+    def advance(self, dt):
+        """
+        Moves all the Mobs by as many Cells as they go in dt seconds at once, and removes the ones that left the Grid.
+        Unlike update(), nothing is checked on the way: the caller makes sure that no Mob hits anything meanwhile.
+
+        Parameters:
+            dt (float): the amount of time (in seconds) to advance.
+        """
+        mobs = self.__mobs
+        moves = mobs.advance(dt)
+        moved = moves.nonzero()[0]
+        if not len(moved):
+            return
+        x, y = mobs.get_column("x"), mobs.get_column("y")
+        if self.__occupancy:
+            steps = mobs.get_column("direction")[moved] + 2
+            start_x = x[moved] - EntityStore.STEP_X[steps]*moves[moved]
+            start_y = y[moved] - EntityStore.STEP_Y[steps]*moves[moved]
+            for old_x, old_y, i in zip(start_x.tolist(), start_y.tolist(), moved.tolist()):
+                self.__occupancy.move(Occupancy.MOB, (old_x, old_y), (int(x[i]), int(y[i])))
+        out = (x.view(np.uint32) >= self.__grid_size[0]) | (y.view(np.uint32) >= self.__grid_size[1])
+        self.remove_mobs(out.nonzero()[0].tolist())
+
+    def spawn_mob(self, kind="fireball"):
+        """
+        Spawns a Mob on a random Cell of a random border of the Grid, heading to the opposite border.
+
+        Parameters:
+            kind (string): the kind of the Mob (see kinds.KINDS). Default="fireball".
+        """
+        choice = self.__rng.randrange(4)
+        if choice == 0:
+            x, y, direction = 0, self.__rng.randrange(self.__grid_size[1]), 1
+        elif choice == 1:
+            x, y, direction = self.__grid_size[0]-1, self.__rng.randrange(self.__grid_size[1]), -1
+        elif choice == 2:
+            x, y, direction = self.__rng.randrange(self.__grid_size[0]), 0, 2
+        else:
+            x, y, direction = self.__rng.randrange(self.__grid_size[0]), self.__grid_size[1]-1, -2
+        self.__mobs.spawn(kind, x, y, direction)
+        if self.__occupancy:
+            self.__occupancy.add(Occupancy.MOB, (x, y))
+
+    def spawn_apple(self, kind, banned_pos, init_time):
+        """
+        Spawns an Apple of a desired kind on a random free Cell of the Grid, and returns its index in the Apples' EntityStore.
+        If every Cell is taken, no Apple is spawned and -1 is returned.
+
+        Parameters:
+            kind (string): the kind of the Apple (see kinds.KINDS: apple, golden_apple, poison_apple).
+            banned_pos (list): a list of xy positions that the Apple cannot be spawned on. With an Occupancy index, the Snake's segments are banned already.
+            init_time (float): the game time at which the function is called.
+        """
+        if self.__occupancy:
+            pos = self.__occupancy.sample_free(self.__rng, banned_pos)
+        else:
+            taken = set(banned_pos) | set(self.get_apple_pos())
+            free = [(x, y) for x in range(self.__grid_size[0]) for y in range(self.__grid_size[1]) if (x, y) not in taken]
+            pos = self.__rng.choice(free) if free else None
+        if pos is None:
+            return -1
+        index = self.__apples.spawn(kind, *pos, init_time=init_time)
+        if self.__occupancy:
+            self.__occupancy.add(Occupancy.APPLE, pos)
+        return index
+
+    def reset_mob(self):
+        """
+        Deletes all Mobs on the Grid.
+        """
+        if self.__occupancy:
+            for pos in self.__mobs.get_positions():
+                self.__occupancy.remove(Occupancy.MOB, pos)
+        self.__mobs.clear()
+
+    def heal(self, value):
+        """
+        Heals the Hawk with a specified amount.
+
+        Parameters:
+            value (int): the amount of health to be healed.
+        """
+        self.__health = min(self.__health + value, Hawk.MAX_HEALTH)
+
+    def damage(self, value):
+        """
+        Reduces the Hawk's health.
+
+        Parameters:
+            value (int): the amount of health to be reduced.
+        """
+        self.__health = max(self.__health - value, 0)
+
+    def is_dead(self):
+        """
+        Returns True if Hawk's health dropped to 0, else False.
+        """
+        return self.__health == 0
+
+    def get_health(self):
+        """
+        Returns Hawk's current health.
+        """
+        return self.__health
+
+    def get_mobs(self):
+        """
+        Returns the EntityStore of the Mobs currently on the Grid.
+        """
+        return self.__mobs
+
+    def get_apples(self):
+        """
+        Returns the EntityStore of the Apples currently on the Grid.
+        """
+        return self.__apples
+
+    def get_apple_pos(self):
+        """
+        Returns a list of Apples' xy position currently on the Grid.
+        """
+        return self.__apples.get_positions()
+
+    def get_mob_pos(self):
+        """
+        Returns a list of Mobs' xy position currently on the Grid.
+        """
+        return self.__mobs.get_positions()
+
+    def remove_mobs(self, indexes):
+        """
+        Removes several Mobs from the Grid at once (the other Mobs keep their order).
+
+        Parameters:
+            indexes (list): the indexes of the Mobs to be removed.
+        """
+        if not indexes:
+            return
+        if self.__occupancy:
+            for i in indexes:
+                self.__occupancy.remove(Occupancy.MOB, self.__mobs.get_pos(i))
+        self.__mobs.remove(indexes)
+
+    def pop_apple(self, index):
+        """
+        Removes an Apple from the Grid with a specified index.
+
+        Parameters:
+            index (int): the index of the Apple to be removed.
+
+        Returns:
+            kind (string): the kind of the Apple.
+        """
+        kind = self.__apples.get_kind(index)
+        if self.__occupancy:
+            self.__occupancy.remove(Occupancy.APPLE, self.__apples.get_pos(index))
+        self.__apples.remove([index])
+        return kind
+
+    def get_store_stats(self):
+        """
+        Returns a dict of the stats of the Mobs' and the Apples' EntityStores (see EntityStore.get_stats()).
+        """
+        return {"mob": self.__mobs.get_stats(), "apple": self.__apples.get_stats()}
@@ -0,0 +1,27 @@
+from . import colors
+
+# Every kind of Mob and Apple, by name. A new kind is only a new entry here (and a spawn wave in Engine.WAVES):
+# the Engine, the EntityStore and the drawing read these fields instead of testing the kind.
+#   layer: "mob" (moves in a straight line, hits the Snake) or "apple" (stays still, eaten by the Snake).
+#   type: the type of the Cells it is drawn in.
+#   color: its RGB color code.
+#   speed: the number of Cells a mob moves per second (0 for apples).
+#   duration: the number of seconds an apple stays on the Grid, None if it stays forever.
+#   event: the event of the Engine when the Snake eats the apple or is hit by the mob.
+#   health: the health given to the Hawk (negative to damage it) when eaten, per deleted segment for a mob hit.
+#   lives: the lives the Snake gains when eating the apple.
+#   grow: whether the Snake grows when eating the apple (else it only moves).
+#   decay: whether the Snake loses its last segment when eating the apple.
+#   respawn: whether an apple of the same kind is spawned when the apple is eaten.
+KINDS = {
+    "fireball": {"layer": "mob", "type": "mob", "color": colors.purple, "speed": 5, "duration": None, "event": "damage", "health": 50},
+    "apple": {"layer": "apple", "type": "apple", "color": colors.red, "speed": 0, "duration": None,
+              "event": "coin", "health": -100, "lives": 0, "grow": True, "decay": False, "respawn": True},
+    "golden_apple": {"layer": "apple", "type": "golden_apple", "color": colors.gold, "speed": 0, "duration": 5,
+                     "event": "coin", "health": -500, "lives": 1, "grow": False, "decay": False, "respawn": False},
+    "poison_apple": {"layer": "apple", "type": "poison_apple", "color": colors.gray, "speed": 0, "duration": 5,
+                     "event": "damage", "health": 20, "lives": 0, "grow": False, "decay": True, "respawn": False},
+}
+# Every kind gets an integer code (its index in KIND_NAMES), stored in the kind column of the EntityStore
+KIND_NAMES = list(KINDS)
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
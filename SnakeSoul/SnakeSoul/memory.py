@@ -0,0 +1,86 @@
+import sys
+import types
+from . import colors
+from .object import TYPES
+import numpy as np
+from .snake import Snake
+from .store import EntityStore
+from .engine import Engine
+
+def sizeof(obj, shared=()):
+    """
+    Returns the memory (in bytes) used by an object and everything it references (attributes, __slots__, items of
+    containers,...), each object being counted once. Classes, modules, functions, None, booleans, small integers and the
+    shared objects are not counted.
+
+    Parameters:
+        obj (object): the object to be measured.
+        shared (list): objects shared between many instances (palette colors, type names,...), not counted. Default=().
+    """
+    seen = set(map(id, shared))
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or o is None or isinstance(o, (bool, type, types.ModuleType, types.FunctionType, types.MethodType)):
+            continue
+        if isinstance(o, int) and -5 <= o <= 256:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, bytearray, int, float)):
+            if hasattr(o, "__dict__"):
+                stack.append(vars(o))
+            for cls in type(o).__mro__:
+                for slot in cls.__dict__.get("__slots__", ()):
+                    # Private slots are name-mangled like any other attribute
+                    name = f"_{cls.__name__.lstrip('_')}{slot}" if slot.startswith("__") and not slot.endswith("__") else slot
+                    if hasattr(o, name):
+                        stack.append(getattr(o, name))
+    return total
+
+def report(seed=0, seconds=120):
+    """
+    Returns a list of (name, bytes) with the memory used by a Mob or Apple (a row of the EntityStore), the Snake and a GameState.
+
+    Parameters:
+        seed (int): the seed of the game measured. Default=0.
+        seconds (int): the game time (in seconds) simulated before measuring the GameState. Default=120.
+    """
+    shared = colors.PALETTE + TYPES
+    rows = [
+        ("Mob or Apple (EntityStore row)", sum(np.dtype(dtype).itemsize for _, dtype in EntityStore.COLUMNS)),
+        ("Snake (one segment)", sizeof(Snake(9, 9, 3, capacity=18*18), shared)),
+    ]
+    engine = Engine(lives=10**6)
+    state = engine.reset(seed)
+    rows.append(("GameState (new game)", sizeof(state, shared)))
+    engine.fast_forward(seconds)
+    rows.append((f"GameState (after {seconds} s, {len(state.hawk.get_mobs())} Fireballs, {len(state.hawk.get_apples())} Apples)", sizeof(state, shared)))
+    return rows
+
+def store_report(seed=0, seconds=600):
+    """
+    Plays a game (without input) and returns the stats of its EntityStores (see Hawk.get_store_stats()).
+    The columns are only reallocated while the stores fill up for the first time, however many entities are spawned.
+
+    Parameters:
+        seed (int): the seed of the game played. Default=0.
+        seconds (int): the game time (in seconds) simulated. Default=600.
+    """
+    engine = Engine(lives=10**6)
+    state = engine.reset(seed)
+    engine.fast_forward(seconds)
+    return state.hawk.get_store_stats()
+
+if __name__ == "__main__":
+    # python -m SnakeSoul.memory: prints the memory used per entity and per GameState, and the allocations of the EntityStores
+    for name, size in report():
+        print(f"{name:<60} {size:>8} bytes")
+    for layer, stats in store_report().items():
+        print(f"EntityStore {layer:<8} " + ", ".join(f"{key} {value}" for key, value in stats.items()))
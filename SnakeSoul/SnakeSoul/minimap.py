@@ -0,0 +1,74 @@
+import numpy as np
+import pygame
+from . import colors
+from .kinds import KINDS
+from .occupancy import Occupancy
+
+class Minimap:
+    """
+    Map of the whole world drawn in a corner of the screen: every pixel block shows whether Mobs, Apples or the Snake
+    are in the part of the world it covers (in this order of priority), with the outline of the Camera's view on top.
+    It is made from the chunks of the Occupancy layers (no list of Objects is walked) as a small array of palette
+    indexes, turned into a Surface with surfarray and scaled once. It is only remade every period, so it costs
+    nothing on most frames.
+    """
+    # Palette index -> color: background, Snake, Apple, Mob (the colors of the Apples and the Fireballs on the Grid)
+    PALETTE = [colors.dark_green, colors.green, KINDS["apple"]["color"], KINDS["fireball"]["color"]]
+    LAYERS = [(Occupancy.SNAKE, 1), (Occupancy.APPLE, 2), (Occupancy.MOB, 3)]
+    def __init__(self, rect, world_shape, period=0.5):
+        """
+        Initializes the Minimap object.
+
+        Parameters:
+            rect (pygame.Rect): the area of the screen covered by the Minimap.
+            world_shape (tuple): the shape of the world (number of Cell rows, number of Cell columns).
+            period (float): the game time (in seconds) between two updates. Default=0.5.
+        """
+        self.__rect = pygame.Rect(rect)
+        self.__world = tuple(world_shape)
+        # One value per pixel at most: a world larger than the Minimap is downsampled, a smaller one is scaled up
+        self.__shape = (min(self.__world[0], self.__rect.width), min(self.__world[1], self.__rect.height))
+        self.__period = period
+        self.__updated = None
+        self.__surface = None
+
+    def update(self, occupancy, time, view=None):
+        """
+        Remakes the Minimap if a period passed since the last update, and returns True if it did, else False.
+
+        Parameters:
+            occupancy (Occupancy): the Occupancy index of the world.
+            time (float): the game time (in seconds).
+            view (pygame.Rect): the Cells shown on screen (xy position and size in Cells), outlined if given. Default=None.
+        """
+        if self.__updated is not None and 0 <= time - self.__updated < self.__period:
+            return False
+        self.__updated = time
+        indexes = np.zeros(self.__shape, np.uint8)
+        for layer, index in Minimap.LAYERS:
+            indexes[occupancy.downsample(layer, self.__shape)] = index
+        small = pygame.surfarray.make_surface(indexes)
+        small.set_palette(Minimap.PALETTE + [(0, 0, 0)]*(256 - len(Minimap.PALETTE)))
+        self.__surface = pygame.transform.scale(small, self.__rect.size)
+        if view:
+            scale_x, scale_y = self.__rect.width/self.__world[0], self.__rect.height/self.__world[1]
+            outline = pygame.Rect(view.x*scale_x, view.y*scale_y, max(view.width*scale_x, 2), max(view.height*scale_y, 2))
+            pygame.draw.rect(self.__surface, colors.white, outline, 1)
+        return True
+
+    def draw(self, screen):
+        """
+        Draws the Minimap and its border.
+
+        Parameters:
+            screen (pygame.Surface): the surface to be drawn on.
+        """
+        if self.__surface:
+            screen.blit(self.__surface, self.__rect.topleft)
+        pygame.draw.rect(screen, colors.black, self.__rect, 1)
+
+    def get_rect(self):
+        """
+        Returns the area of the screen covered by the Minimap (pygame.Rect).
+        """
+        return self.__rect
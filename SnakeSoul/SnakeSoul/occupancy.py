@@ -0,0 +1,264 @@
+from array import array
+import numpy as np
+
+class Occupancy:
+    """
+    Occupancy index of the Grid: one layer per kind of Object (Snake, Apples, Mobs), each counting the Objects on every
+    Cell with 16-bit counters (hundreds of Fireballs can pile up on a Cell), so "is there something here" is an O(1) lookup
+    instead of a scan over a list of positions. It is updated incrementally as Objects move.
+    The layers are sparse: the Grid is cut into chunks of CHUNK x CHUNK Cells, and a layer only holds an array for the
+    chunks that have Objects on them. A chunk is allocated when an Object enters it and dropped as soon as it is empty
+    (the last few are kept to be reused), so the memory follows the area the Objects cover instead of the size of the Grid.
+    The free Cells (no Snake segment and no Apple, where an Apple can be spawned) are not listed, only counted per chunk.
+    While at least half of the Grid is free, one is sampled by drawing Cells until one is free. Otherwise the counts lead
+    to the chunk holding the n-th free Cell, skipping whole chunks, and the Cell is found in that chunk with NumPy.
+    Every move, spawn and despawn also marks the Cells it touched, and pop_changes() hands this diff out (to redraw only
+    those Cells). A Cell is listed once however often it changed. The diff is only kept once pop_changes() was called
+    once, so a headless game does not collect it.
+    """
+    SNAKE, APPLE, MOB = 0, 1, 2
+    CHUNK = 32      # number of Cell rows and columns of a chunk (a power of 2)
+    SPARE = 16      # number of empty chunks kept to be reused
+    __SHIFT = CHUNK.bit_length() - 1
+    __MASK = CHUNK - 1
+    def __init__(self, shape):
+        """
+        Initializes the Occupancy object.
+
+        Parameters:
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns).
+        """
+        self.__rows = shape[0]
+        self.__cols = shape[1]
+        self.__chunks = [{}, {}, {}]    # per layer, (chunk x, chunk y) -> array of the counters of its Cells
+        self.__totals = [{}, {}, {}]    # per layer, (chunk x, chunk y) -> number of Objects on the chunk
+        self.__spare = []               # empty chunk arrays to be reused, the most recently dropped last
+        self.__taken = 0                # number of Cells with a Snake segment or an Apple
+        self.__taken_in = {}            # (chunk x, chunk y) -> number of Cells with a Snake segment or an Apple in the chunk
+        self.__changed = None           # xy positions of the Cells changed since the last pop_changes(), in order
+        self.__allocated = 0
+        self.__reused = 0
+
+    def __locate(self, pos):
+        # (chunk key, index of the Cell in the chunk), or None out of the Grid
+        x, y = pos
+        if 0 <= x < self.__rows and 0 <= y < self.__cols:
+            return (x >> Occupancy.__SHIFT, y >> Occupancy.__SHIFT), (x & Occupancy.__MASK)*Occupancy.CHUNK + (y & Occupancy.__MASK)
+        return None
+
+    def __get(self, layer, key, i):
+        chunk = self.__chunks[layer].get(key)
+        return chunk[i] if chunk is not None else 0
+
+    def add(self, layer, pos):
+        """
+        Marks one more Object of a layer on a Cell. Positions out of the Grid are ignored.
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            pos (tuple): xy position on the Grid.
+        """
+        location = self.__locate(pos)
+        if location is None:
+            return
+        key, i = location
+        if layer != Occupancy.MOB and not self.__is_taken(key, i):
+            self.__taken += 1
+            self.__taken_in[key] = self.__taken_in.get(key, 0) + 1
+        chunk = self.__chunks[layer].get(key)
+        if chunk is None:
+            chunk = self.__chunks[layer][key] = self.__new_chunk()
+            self.__totals[layer][key] = 0
+        chunk[i] += 1
+        self.__totals[layer][key] += 1
+        if self.__changed is not None:
+            self.__changed[pos] = None
+
+    def remove(self, layer, pos):
+        """
+        Removes one Object of a layer from a Cell. Positions out of the Grid are ignored.
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            pos (tuple): xy position on the Grid.
+        """
+        location = self.__locate(pos)
+        if location is None:
+            return
+        key, i = location
+        chunk = self.__chunks[layer].get(key)
+        if chunk is None or not chunk[i]:
+            return
+        chunk[i] -= 1
+        if self.__changed is not None:
+            self.__changed[pos] = None
+        self.__totals[layer][key] -= 1
+        if not self.__totals[layer][key]:
+            self.__drop_chunk(layer, key)
+        if layer != Occupancy.MOB and not self.__is_taken(key, i):
+            self.__taken -= 1
+            self.__taken_in[key] -= 1
+            if not self.__taken_in[key]:
+                del self.__taken_in[key]
+
+    def move(self, layer, old_pos, new_pos):
+        """
+        Moves one Object of a layer from a Cell to another.
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            old_pos (tuple): the previous xy position on the Grid.
+            new_pos (tuple): the new xy position on the Grid.
+        """
+        # Adding first keeps a chunk left by its only Object allocated when the Object stays in it
+        self.add(layer, new_pos)
+        self.remove(layer, old_pos)
+
+    def has(self, layer, pos):
+        """
+        Returns True if the Cell holds an Object of the layer, else False (also False out of the Grid).
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            pos (tuple): xy position on the Grid.
+        """
+        location = self.__locate(pos)
+        return location is not None and self.__get(layer, *location) > 0
+
+    def sample_free(self, rng, banned_pos=()):
+        """
+        Returns a uniformly random free Cell (no Snake segment and no Apple), or None if there is none.
+
+        Parameters:
+            rng (random.Random): the random number generator.
+            banned_pos (list): xy positions that cannot be returned either. Default=().
+        """
+        banned = {}    # (chunk x, chunk y) -> indexes in the chunk of the banned Cells that are free
+        for pos in banned_pos:
+            location = self.__locate(pos)
+            if location is not None and not self.__is_taken(*location):
+                banned.setdefault(location[0], set()).add(location[1])
+        size = self.__rows*self.__cols
+        free = size - self.__taken - sum(map(len, banned.values()))
+        if free <= 0:
+            return None
+        if 2*free >= size:
+            # At least half of the Grid is free: fewer than 2 draws on average
+            while True:
+                pos = divmod(rng.randrange(size), self.__cols)
+                key, i = self.__locate(pos)
+                if not self.__is_taken(key, i) and i not in banned.get(key, ()):
+                    return pos
+        # Most of the Grid is taken: skip the chunks with fewer free Cells than n, then find the n-th free Cell of the chunk
+        n = rng.randrange(free)
+        size = Occupancy.CHUNK
+        for cx in range(-(-self.__rows//size)):
+            for cy in range(-(-self.__cols//size)):
+                key = (cx, cy)
+                rows, cols = min(size, self.__rows - cx*size), min(size, self.__cols - cy*size)
+                chunk_free = rows*cols - self.__taken_in.get(key, 0) - len(banned.get(key, ()))
+                if n >= chunk_free:
+                    n -= chunk_free
+                    continue
+                is_free = np.zeros((size, size), bool)
+                is_free[:rows, :cols] = True
+                is_free = is_free.reshape(-1)
+                for layer in (Occupancy.SNAKE, Occupancy.APPLE):
+                    if key in self.__chunks[layer]:
+                        is_free &= np.frombuffer(self.__chunks[layer][key], np.uint16) == 0
+                is_free[list(banned.get(key, ()))] = False
+                x, y = divmod(int(np.flatnonzero(is_free)[n]), size)
+                return cx*size + x, cy*size + y
+
+    def count(self, layer, pos):
+        """
+        Returns the number of Objects of a layer on a Cell (0 out of the Grid).
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            pos (tuple): xy position on the Grid.
+        """
+        location = self.__locate(pos)
+        return self.__get(layer, *location) if location is not None else 0
+
+    def count_many(self, layer, xs, ys):
+        """
+        Returns an array of the number of Objects of a layer on many Cells (0 out of the Grid), one chunk at a time.
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            xs (numpy.ndarray): the x positions on the Grid.
+            ys (numpy.ndarray): the y positions on the Grid (as many as xs).
+        """
+        counts = np.zeros(len(xs), np.uint16)
+        chunks = self.__chunks[layer]
+        if not chunks or not len(xs):
+            return counts
+        # The Cells out of the Grid but in a chunk on its edge always count 0, the others are in no chunk
+        cx, cy = xs >> Occupancy.__SHIFT, ys >> Occupancy.__SHIFT
+        for (i, j), chunk in chunks.items():
+            inside = ((cx == i) & (cy == j)).nonzero()[0]
+            if len(inside):
+                cells = np.frombuffer(chunk, np.uint16)
+                counts[inside] = cells[(xs[inside] & Occupancy.__MASK)*Occupancy.CHUNK + (ys[inside] & Occupancy.__MASK)]
+        return counts
+
+    def downsample(self, layer, shape):
+        """
+        Returns a boolean array of a smaller shape telling which blocks of the Grid hold Objects of a layer, made from
+        the chunks in use only.
+
+        Parameters:
+            layer (int): the layer (SNAKE, APPLE, MOB).
+            shape (tuple): the shape of the array, at most the shape of the Grid.
+        """
+        blocks = np.zeros(shape, bool)
+        chunks = self.__chunks[layer]
+        if not chunks:
+            return blocks
+        # Every chunk in use side by side in one array, then the Cells with Objects found in one pass
+        cells = np.frombuffer(b"".join(chunks.values()), np.uint16).reshape(len(chunks), Occupancy.CHUNK, Occupancy.CHUNK)
+        keys = np.array(list(chunks), np.int64)*Occupancy.CHUNK
+        ks, xs, ys = cells.nonzero()
+        blocks[(xs + keys[ks, 0])*shape[0]//self.__rows, (ys + keys[ks, 1])*shape[1]//self.__cols] = True
+        return blocks
+
+    def pop_changes(self):
+        """
+        Returns the list of xy positions of the Cells changed (an Object added, removed or moved on them) since the last
+        call (an empty list the first time).
+        """
+        changed = list(self.__changed or ())
+        self.__changed = {}
+        return changed
+
+    def get_stats(self):
+        """
+        Returns a dict with the number of chunks in use per layer, the number of empty chunks kept, the number of chunks
+        allocated and the number of chunks reused.
+        """
+        return {
+            "snake_chunks": len(self.__chunks[Occupancy.SNAKE]),
+            "apple_chunks": len(self.__chunks[Occupancy.APPLE]),
+            "mob_chunks": len(self.__chunks[Occupancy.MOB]),
+            "spare": len(self.__spare),
+            "allocated": self.__allocated,
+            "reused": self.__reused,
+        }
+
+    def __is_taken(self, key, i):
+        return self.__get(Occupancy.SNAKE, key, i) > 0 or self.__get(Occupancy.APPLE, key, i) > 0
+
+    def __new_chunk(self):
+        if self.__spare:
+            self.__reused += 1
+            return self.__spare.pop()
+        self.__allocated += 1
+        return array("H", bytes(2*Occupancy.CHUNK*Occupancy.CHUNK))
+
+    def __drop_chunk(self, layer, key):
+        # An empty chunk only holds zeros, so it can be reused as it is
+        chunk = self.__chunks[layer].pop(key)
+        del self.__totals[layer][key]
+        if len(self.__spare) < Occupancy.SPARE:
+            self.__spare.append(chunk)
@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+
+def gaussian_blur(surface, radius):
+    """
+    Returns a blurred copy of a Surface (downscaled by radius, then scaled back up).
+
+    Parameters:
+        surface (pygame.Surface): the Surface to be blurred.
+        radius (int): the strength of the blur.
+    """
+    scaled_surface = pygame.transform.smoothscale(surface, (surface.get_width() // radius, surface.get_height() // radius))
+    scaled_surface = pygame.transform.smoothscale(scaled_surface, (surface.get_width(), surface.get_height()))
+    return scaled_surface
+
+def darken(surface, factor):
+    """
+    Returns a darker copy of a Surface.
+
+    Parameters:
+        surface (pygame.Surface): the Surface to be darkened.
+        factor (float): the brightness kept, between 0 (black) and 1 (unchanged).
+    """
+    darker = surface.copy()
+    level = int(255*factor)
+    darker.fill((level, level, level), special_flags=pygame.BLEND_MULT)
+    return darker
+
+def freeze_frame(surface, radius=5, factor=0.5):
+    """
+    Returns a blurred and darkened snapshot of a Surface (e.g. the last gameplay frame), to be used as the background of a menu.
+
+    Parameters:
+        surface (pygame.Surface): the Surface to be captured.
+        radius (int): the strength of the blur. Default=5.
+        factor (float): the brightness kept, between 0 (black) and 1 (unchanged). Default=0.5.
+    """
+    return darken(gaussian_blur(surface, radius), factor)
+
+class BlurCache:
+    """
+    LRU cache of blurred Surfaces keyed by (source Surface, radius, size), so a blur is only computed once per source.
+    """
+    def __init__(self, max_entries=8):
+        """
+        Initializes the BlurCache object.
+
+        Parameters:
+            max_entries (int): the maximum number of blurred Surfaces kept. Default=8.
+        """
+        self.__max_entries = max_entries
+        self.__surfaces = OrderedDict()
+
+    def get(self, surface, radius, size=None):
+        """
+        Returns the blurred Surface, computing it only if it is not cached yet. The Surface is shared and must not be drawn on.
+
+        Parameters:
+            surface (pygame.Surface): the source Surface (it must not be modified while it is cached).
+            radius (int): the strength of the blur.
+            size (tuple): if not None, the source is scaled to this size before being blurred. Default=None.
+        """
+        key = (surface, radius, size)
+        blurred = self.__surfaces.get(key)
+        if blurred is not None:
+            self.__surfaces.move_to_end(key)
+            return blurred
+        source = pygame.transform.smoothscale(surface, size) if size else surface
+        blurred = gaussian_blur(source, radius)
+        self.__surfaces[key] = blurred
+        if len(self.__surfaces) > self.__max_entries:
+            self.__surfaces.popitem(last=False)
+        return blurred
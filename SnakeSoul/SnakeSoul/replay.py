@@ -0,0 +1,229 @@
+import sys
+import time
+import zlib
+from .engine import Engine
+
+# Replay file: MAGIC, then a zlib-compressed stream of unsigned varints:
+#   VERSION, seed, rows, columns, lives, tick rate, number of ticks, checkpoint interval,
+#   number of input changes, then (ticks since the previous change, action code) for each change,
+#   number of checkpoints, then the checksum of the game at each checkpoint, and the checksum after the last tick.
+MAGIC = b"SSRP"
+VERSION = 1
+ACTIONS = [None, -2, -1, 1, 2]    # action code -> direction
+
+class Replay:
+    """
+    A recorded game: the seed of the Engine and the action given to Engine.step() on every tick.
+    Only the ticks where the action changes are stored, and a checksum chained over the state of every tick is kept at
+    regular checkpoints, so a playback can tell whether it still produces the same game (and from which tick it differs).
+    """
+    def __init__(self, seed, shape=(18, 18), lives=3, tick_rate=60, checkpoint=60):
+        """
+        Initializes the Replay object.
+
+        Parameters:
+            seed (int): the seed of the game (a non-negative integer).
+            shape (tuple): the shape of the Grid (number of Cell rows, number of Cell columns). Default=(18, 18).
+            lives (int): the number of lives of the Snake at the start of the game. Default=3.
+            tick_rate (int): the number of Engine steps per second of game time. Default=60.
+            checkpoint (int): the number of ticks between two stored checksums. Default=60.
+        """
+        if not isinstance(seed, int) or seed < 0:
+            raise ValueError("the seed of a Replay must be a non-negative integer")
+        self.__seed = seed
+        self.__shape = tuple(shape)
+        self.__lives = lives
+        self.__tick_rate = tick_rate
+        self.__checkpoint = checkpoint
+        self.__ticks = 0
+        self.__changes = []    # (tick, action code) each time the action changes
+        self.__checksums = []
+        self.__checksum = 0
+
+    def record(self, action, state):
+        """
+        Adds a tick to the Replay.
+
+        Parameters:
+            action (int): the action given to Engine.step() (top: -2, right: 1, down: 2, left: -1, or None).
+            state (GameState): the GameState after the step.
+        """
+        code = ACTIONS.index(action)
+        previous = self.__changes[-1][1] if self.__changes else 0
+        if code != previous:
+            self.__changes.append((self.__ticks, code))
+        self.__ticks += 1
+        self.__checksum = checksum(state, self.__checksum)
+        if self.__ticks % self.__checkpoint == 0:
+            self.__checksums.append(self.__checksum)
+
+    def actions(self):
+        """
+        Yields the action of every tick.
+        """
+        code = 0
+        start = 0
+        for tick, next_code in self.__changes + [(self.__ticks, 0)]:
+            for _ in range(tick - start):
+                yield ACTIONS[code]
+            start, code = tick, next_code
+
+    def play(self, verify=True):
+        """
+        Simulates the recorded game without any display, as fast as possible, and returns (GameState, tick) where tick is
+        the first tick of the checkpoint interval in which the game stopped matching the recording (-1 if it matched).
+
+        Parameters:
+            verify (bool): whether the checksums are compared. If False, tick is always -1. Default=True.
+        """
+        engine = Engine(self.__shape, self.__lives)
+        state = engine.reset(self.__seed)
+        dt = 1/self.__tick_rate
+        value = 0
+        for tick, action in enumerate(self.actions()):
+            engine.step(action, dt)
+            if not verify:
+                continue
+            value = checksum(state, value)
+            if (tick+1) % self.__checkpoint == 0 and self.__checksums[tick//self.__checkpoint] != value:
+                return state, tick - tick % self.__checkpoint
+        if verify and value != self.__checksum:
+            return state, self.__ticks - self.__ticks % self.__checkpoint
+        return state, -1
+
+    def to_bytes(self):
+        """
+        Returns the Replay encoded in the replay file format.
+        """
+        data = bytearray()
+        for value in (VERSION, self.__seed, *self.__shape, self.__lives, self.__tick_rate, self.__ticks, self.__checkpoint, len(self.__changes)):
+            write_varint(data, value)
+        previous = 0
+        for tick, code in self.__changes:
+            write_varint(data, tick - previous)
+            write_varint(data, code)
+            previous = tick
+        write_varint(data, len(self.__checksums))
+        for value in self.__checksums:
+            write_varint(data, value)
+        write_varint(data, self.__checksum)
+        return MAGIC + zlib.compress(bytes(data), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Returns the Replay decoded from the replay file format.
+
+        Parameters:
+            data (bytes): the content of a replay file.
+        """
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a SnakeSoul replay")
+        data = zlib.decompress(data[len(MAGIC):])
+        pos = 0
+        def read():
+            nonlocal pos
+            value, pos = read_varint(data, pos)
+            return value
+        if read() != VERSION:
+            raise ValueError("unsupported replay version")
+        seed, rows, cols, lives, tick_rate, ticks, checkpoint = (read() for _ in range(7))
+        replay = cls(seed, (rows, cols), lives, tick_rate, checkpoint)
+        tick = 0
+        for _ in range(read()):
+            tick += read()
+            replay.__changes.append((tick, read()))
+        replay.__checksums = [read() for _ in range(read())]
+        replay.__checksum = read()
+        replay.__ticks = ticks
+        return replay
+
+    def save(self, path):
+        """
+        Writes the Replay to a file.
+
+        Parameters:
+            path (string): the path of the file.
+        """
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns the Replay read from a file.
+
+        Parameters:
+            path (string): the path of the file.
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def get_seed(self):
+        """
+        Returns the seed of the game.
+        """
+        return self.__seed
+
+    def get_ticks(self):
+        """
+        Returns the number of recorded ticks.
+        """
+        return self.__ticks
+
+def checksum(state, value=0):
+    """
+    Returns the CRC-32 of the state of a game, chained to a previous checksum.
+
+    Parameters:
+        state (GameState): the GameState to be hashed.
+        value (int): the previous checksum. Default=0.
+    """
+    hawk = state.hawk
+    apples = list(zip(hawk.get_apple_pos(), hawk.get_apples().get_kinds()))
+    key = (state.snake.get_segments_pos(), state.snake.get_lives(), apples, hawk.get_mob_pos(), hawk.get_health(), state.is_day, state.result)
+    return zlib.crc32(repr(key).encode(), value)
+
+def write_varint(data, value):
+    """
+    Appends an unsigned integer to a bytearray, 7 bits per byte (LEB128).
+
+    Parameters:
+        data (bytearray): the bytearray.
+        value (int): a non-negative integer.
+    """
+    while value >= 0x80:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+
+def read_varint(data, pos):
+    """
+    Returns (value, position after it) of an unsigned integer written by write_varint().
+
+    Parameters:
+        data (bytes): the encoded data.
+        pos (int): the position of the first byte of the integer.
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+if __name__ == "__main__":
+    # python -m SnakeSoul.replay FILE...: plays the replays back and checks that they still give the same games
+    failed = False
+    for path in sys.argv[1:]:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        state, tick = replay.play()
+        elapsed = time.perf_counter() - start
+        speed = replay.get_ticks()/max(elapsed, 1e-9)
+        status = "ok" if tick == -1 else f"MISMATCH from tick {tick}"
+        print(f"{path}: {replay.get_ticks()} ticks, {state.result or 'unfinished'}, {speed:.0f} ticks/s, {status}")
+        failed |= tick != -1
+    sys.exit(1 if failed else 0)
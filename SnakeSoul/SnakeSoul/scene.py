@@ -0,0 +1,72 @@
+import pygame
+
+class Scene:
+    """
+    Runs a static screen (menu, pause, tutorial,...). Instead of redrawing as fast as possible, it sleeps in pygame.event.wait()
+    and only redraws when something visible changes (a Button starts or stops being hovered, the window is exposed,...).
+    Redraws are capped to fps while the window has the focus, and to idle_fps while it does not.
+    """
+    def __init__(self, draw, buttons, fps=30, idle_fps=5, timeout=1000):
+        """
+        Initializes the Scene object.
+
+        Parameters:
+            draw (function): called with the screen Surface to draw everything but the Buttons.
+            buttons (list): the Buttons of the screen.
+            fps (int): the maximum number of redraws per second while the window has the focus. Default=30.
+            idle_fps (int): the maximum number of redraws per second while the window does not have the focus. Default=5.
+            timeout (int): the longest time (in milliseconds) spent waiting for an event before checking the mouse again. Default=1000.
+        """
+        self.__draw = draw
+        self.__buttons = buttons
+        self.__fps = fps
+        self.__idle_fps = idle_fps
+        self.__timeout = timeout
+        self.__clock = pygame.time.Clock()
+
+    def run(self, screen, on_click):
+        """
+        Shows the screen until a click on a Button ends it, and returns what on_click returned.
+
+        Parameters:
+            screen (pygame.Surface): the Surface of the display.
+            on_click (function): called with the clicked Button. The screen ends when it returns anything but None.
+        """
+        focused = pygame.key.get_focused()
+        hovered = None
+        redraw = True
+        while True:
+            mouse_pos = pygame.mouse.get_pos()
+            now_hovered = tuple(button.checkForInput(mouse_pos) for button in self.__buttons)
+            if now_hovered != hovered:
+                hovered = now_hovered
+                redraw = True
+
+            if redraw:
+                self.__clock.tick(self.__fps if focused else self.__idle_fps)
+                self.__draw(screen)
+                for button in self.__buttons:
+                    button.changeColor(mouse_pos)
+                    button.update(screen)
+                pygame.display.update()
+                redraw = False
+
+            # Sleep until something happens, then handle everything that is queued
+            events = [pygame.event.wait(self.__timeout)] + pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+                if event.type == pygame.WINDOWFOCUSLOST:
+                    focused = False
+                elif event.type == pygame.WINDOWFOCUSGAINED:
+                    focused = True
+                    redraw = True
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                    redraw = True
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    for button in self.__buttons:
+                        if button.checkForInput(event.pos):
+                            result = on_click(button)
+                            if result is not None:
+                                return result
@@ -0,0 +1,59 @@
+import heapq
+
+class Scheduler:
+    """
+    Priority queue of timed game events (a binary heap ordered by time, then order, then scheduling order).
+    Scheduling and firing an event cost O(log n), and checking for due events costs O(1) when none is due.
+    Cancelled events are only marked, and are dropped when they reach the top of the heap.
+    """
+    def __init__(self):
+        """
+        Initializes the Scheduler object.
+        """
+        self.__heap = []
+        self.__count = 0
+
+    def schedule(self, time, event, order=0):
+        """
+        Adds an event and returns its entry (to be given to cancel()).
+
+        Parameters:
+            time (float): the game time (in seconds) at which the event is due.
+            event (tuple): the event, returned as is by pop_due().
+            order (int): events due at the same time are returned by increasing order. Default=0.
+        """
+        entry = [time, order, self.__count, event, True]
+        self.__count += 1
+        heapq.heappush(self.__heap, entry)
+        return entry
+
+    def cancel(self, entry):
+        """
+        Cancels a scheduled event.
+
+        Parameters:
+            entry (list): the entry returned by schedule().
+        """
+        entry[-1] = False
+
+    def pop_due(self, time):
+        """
+        Yields the events due at or before a game time, in order. Events scheduled while iterating are yielded too if they are due.
+
+        Parameters:
+            time (float): the current game time (in seconds).
+        """
+        heap = self.__heap
+        while heap and heap[0][0] <= time:
+            entry = heapq.heappop(heap)
+            if entry[-1]:
+                yield entry[3]
+
+    def get_next_time(self):
+        """
+        Returns the time of the next event, or None if there is none.
+        """
+        heap = self.__heap
+        while heap and not heap[0][-1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
@@ -0,0 +1,203 @@
+from array import array
+from . import colors
+from .entity import Entity
+from .occupancy import Occupancy
+
+class Snake(Entity):
+    """
+    The protagonist, inherits the Entity class.
+    The segments are kept in a ring buffer of coordinates (32-bit arrays), so moving and growing do not allocate. The buffer
+    starts small and doubles when the Snake fills it, so a Snake on a huge Grid only takes the memory of its length.
+    """
+    __slots__ = ("__xs", "__ys", "__head", "__length", "__positions", "__lives", "__occupancy", "__capacity")
+    BUFFER = 64
+    MAX_SPEED = 10
+    def __init__(self, x, y, lives, occupancy=None, capacity=18*18):
+        """
+        Initializes the Snake object.
+
+        Parameters:
+            x (int): the x position on the Grid.
+            y (int): the y position on the Grid.
+            lives (int): the number of lives.
+            occupancy (Occupancy): the Occupancy index kept up to date with the segments. Default=None.
+            capacity (int): the maximum number of segments (the number of Cells of the Grid). Default=324.
+        """
+        super().__init__(x, y, dir=1, color=colors.green, speed=2)
+        self.__capacity = capacity
+        self.__xs = array("i", [x])*min(capacity, Snake.BUFFER)
+        self.__ys = array("i", [y])*min(capacity, Snake.BUFFER)
+        self.__head = 0
+        self.__length = 1
+        self.__positions = None    # cache of get_segments_pos(), dropped whenever the segments change
+        self.__lives = lives
+        self.__occupancy = occupancy
+        if occupancy:
+            occupancy.add(Occupancy.SNAKE, (x, y))
+
+    def respawn(self, x, y, lives):
+        """
+        Puts the Snake back to a single segment at a position (after it ran out of the border), reusing its segment buffers.
+
+        Parameters:
+            x (int): the x position on the Grid.
+            y (int): the y position on the Grid.
+            lives (int): the number of lives.
+        """
+        self.__delete_segments(0)
+        super().__init__(x, y, dir=1, color=colors.green, speed=2)
+        self.__xs[0] = x
+        self.__ys[0] = y
+        self.__head = 0
+        self.__length = 1
+        self.__positions = None
+        self.__lives = lives
+        if self.__occupancy:
+            self.__occupancy.add(Occupancy.SNAKE, (x, y))
+
+    def move(self):
+        """
+        Updates the segments of the Snake.
+        """
+        tail = self.__segment(self.__length-1)
+        self.__push_head()
+        if self.__occupancy:
+            self.__occupancy.move(Occupancy.SNAKE, tail, (self._x, self._y))
+
+    def grow(self):
+        """
+        Increase the number of Snake's segments by 1.
+        """
+        if self.__length == len(self.__xs):
+            if self.__length == self.__capacity:
+                self.move()
+                return
+            self.__grow_buffer()
+        self.__push_head()
+        self.__length += 1
+        if self.__occupancy:
+            self.__occupancy.add(Occupancy.SNAKE, (self._x, self._y))
+        self.__update_speed()
+
+    def decay(self, index):
+        """
+        Decreases the Snake's segments from the specified index to the end.
+
+        Parameters:
+            index (int): the index from which the segments are deleted.
+        """
+        if index == -1:
+            index += self.__length
+        if index == 0:
+            self.__lives -= 1
+            self.__delete_segments(1)
+            self.__update_speed()
+            return self.__length
+        else:
+            deleted = self.__length - index
+            self.__delete_segments(index)
+            self.__update_speed()
+            return deleted
+
+    def gain_live(self):
+        """
+        Increases Snake's lives by 1.
+        """
+        self.__lives = min(self.__lives + 1, 3)
+
+    def lose_live(self):
+        """
+        Decreases Snake's lives by 1.
+        """
+        self.__lives -= 1
+
+    def self_collide(self):
+        """
+        Returns True if the position of the first segment is the same with the position of any of other segments, else False.
+        """
+        head = (self._x, self._y)
+        if self.__occupancy and not self.__occupancy.has(Occupancy.SNAKE, head):
+            return False
+        for i in range(1, self.__length-1):
+            if self.__segment(i) == head:
+                self.decay(i)
+                self.move()
+                return True
+        return False
+
+    def is_dead(self):
+        """
+        Returns True if the number of Snake's lives is 0, else False.
+        """
+        return self.__lives == 0
+
+    def __segment(self, index):
+        i = (self.__head - index) % len(self.__xs)
+        return self.__xs[i], self.__ys[i]
+
+    def __push_head(self):
+        self.__head = (self.__head + 1) % len(self.__xs)
+        self.__xs[self.__head] = self._x
+        self.__ys[self.__head] = self._y
+        self.__positions = None
+
+    def __grow_buffer(self):
+        # Unrolls the full ring (tail first, head last) into buffers twice as large
+        n = len(self.__xs)
+        start = (self.__head + 1) % n
+        size = min(2*n, self.__capacity)
+        padding = array("i", bytes(4*(size - n)))
+        self.__xs = self.__xs[start:] + self.__xs[:start] + padding
+        self.__ys = self.__ys[start:] + self.__ys[:start] + padding
+        self.__head = n - 1
+
+    def __delete_segments(self, index):
+        if self.__occupancy:
+            for i in range(index, self.__length):
+                self.__occupancy.remove(Occupancy.SNAKE, self.__segment(i))
+        self.__length = max(min(index, self.__length), 1)
+        self.__positions = None
+
+    def __update_speed(self):
+        self._speed = min(2*(self.__length//5) + 2, Snake.MAX_SPEED)
+
+    def get_segment_color(self, index):
+        """
+        Returns the RGB color code of a segment (the head is drawn brighter than the body).
+
+        Parameters:
+            index (int): the index of the segment (0 is the head).
+        """
+        return colors.lime if index == 0 else colors.green
+
+    def getDirection(self):
+        """
+        Returns the current direction of the Snake.
+        """
+        return self._direction
+
+    def get_segments_pos(self):
+        """
+        Returns a tuple of positions of the Snake's segments (head first). The tuple is cached until the segments change.
+        """
+        if self.__positions is None:
+            self.__positions = tuple(self.__segment(i) for i in range(self.__length))
+        return self.__positions
+
+    def get_length(self):
+        """
+        Returns the number of Snake's segments.
+        """
+        return self.__length
+
+    def get_head(self):
+        """
+        Returns the position of the first segment.
+        """
+        return self._x, self._y
+
+    def get_lives(self):
+        """
+        Returns the number of lives.
+        """
+        return self.__lives
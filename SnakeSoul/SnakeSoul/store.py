@@ -0,0 +1,280 @@
+import numpy as np
+from . import colors
+from .kinds import KINDS, KIND_NAMES, KIND_CODES
+
+class EntityStore:
+    """
+    Entity-component store for Mobs and Apples: every entity is a row of typed arrays (kind, position, direction, speed,
+    move period and timer, color code, expiry, id) instead of an Object, and the systems (movement, collision, drawing)
+    work on whole columns at once with NumPy. The rows keep their spawning order: removing entities compacts the columns in place.
+    The columns (and the scratch columns of the compaction) are preallocated and doubled when full, so spawning does not
+    allocate in a running game, and removing only allocates the array of the indexes of the rows kept.
+    """
+    # (name, dtype) of every column
+    COLUMNS = [("kind", np.uint8), ("x", np.int32), ("y", np.int32), ("direction", np.int8), ("speed", np.float64),
+               ("period", np.float64), ("timer", np.float64), ("color", np.uint8), ("expiry", np.int32), ("id", np.int64)]
+    # direction + 2 -> move along x and y (top: -2, left: -1, right: 1, down: 2)
+    STEP_X = np.array([0, -1, 0, 1, 0], np.int32)
+    STEP_Y = np.array([-1, 0, 0, 0, 1], np.int32)
+    def __init__(self, capacity=16):
+        """
+        Initializes the EntityStore object.
+
+        Parameters:
+            capacity (int): the number of rows allocated at first. Default=16.
+        """
+        self.__columns = {name: np.zeros(capacity, dtype) for name, dtype in EntityStore.COLUMNS}
+        self.__scratch = {name: np.zeros(capacity, dtype) for name, dtype in EntityStore.COLUMNS}
+        self.__keep = np.zeros(capacity, bool)
+        self.__count = 0
+        self.__next_id = 0
+        self.__spawned = 0
+        self.__removed = 0
+        self.__grows = 0
+
+    def spawn(self, kind, x, y, direction=0, init_time=None):
+        """
+        Adds an entity of a kind (see kinds.KINDS) and returns its index.
+
+        Parameters:
+            kind (string): the name of the kind.
+            x (int): the x position on the Grid.
+            y (int): the y position on the Grid.
+            direction (int): the direction the entity moves to (top: -2, right: 1, down: 2, left: -1), 0 if it does not move. Default=0.
+            init_time (float): the game time (in seconds) at which the entity is spawned, for the kinds with a duration. Default=None.
+        """
+        if self.__count == len(self.__columns["id"]):
+            self.__grow()
+        spec = KINDS[kind]
+        init = int(init_time) if init_time else None
+        i = self.__count
+        columns = self.__columns
+        columns["kind"][i] = KIND_CODES[kind]
+        columns["x"][i] = x
+        columns["y"][i] = y
+        columns["direction"][i] = direction
+        columns["speed"][i] = spec["speed"]
+        columns["period"][i] = 1/spec["speed"] if spec["speed"] else np.inf
+        columns["timer"][i] = 0
+        columns["color"][i] = colors.code(spec["color"])
+        columns["expiry"][i] = init + spec["duration"] if init and spec["duration"] else -1
+        columns["id"][i] = self.__next_id
+        self.__next_id += 1
+        self.__count += 1
+        self.__spawned += 1
+        return i
+
+    def remove(self, indexes):
+        """
+        Removes entities, the others keep their order.
+
+        Parameters:
+            indexes (list): the indexes of the entities to be removed.
+        """
+        if len(indexes) == 0:
+            return
+        n = self.__count
+        keep = self.__keep[:n]
+        keep[:] = True
+        keep[indexes] = False
+        kept = np.flatnonzero(keep)
+        m = len(kept)
+        # The kept rows are gathered in order into the scratch column, then copied back
+        for name, column in self.__columns.items():
+            scratch = self.__scratch[name][:m]
+            np.take(column[:n], kept, out=scratch)
+            column[:m] = scratch
+        self.__removed += n - m
+        self.__count = m
+
+    def clear(self):
+        """
+        Removes every entity.
+        """
+        self.__removed += self.__count
+        self.__count = 0
+
+    def move(self, dt):
+        """
+        Movement system: advances the move timer of every entity and moves by one Cell the ones whose timer reached
+        its period, 1/speed (the time left over is kept for the next move). Returns the indexes of the entities that moved.
+
+        Parameters:
+            dt (float): the amount of time (in seconds) between function calls.
+        """
+        n = self.__count
+        columns = self.__columns
+        period = columns["period"][:n]
+        timer = columns["timer"][:n]
+        timer += dt
+        moved = (timer >= period).nonzero()[0]
+        if len(moved):
+            timer[moved] -= period[moved]
+            step = columns["direction"][moved] + 2
+            columns["x"][moved] += EntityStore.STEP_X[step]
+            columns["y"][moved] += EntityStore.STEP_Y[step]
+        return moved
+
+    def advance(self, dt):
+        """
+        Movement system over a longer time: advances the move timer of every entity by dt seconds and moves each one by
+        as many Cells as it goes meanwhile, in one go. Returns an array of the number of Cells every entity moved.
+
+        Parameters:
+            dt (float): the amount of time (in seconds) to advance.
+        """
+        n = self.__count
+        columns = self.__columns
+        period = columns["period"][:n]
+        timer = columns["timer"][:n]
+        timer += dt
+        moves = (timer // period).astype(np.int32)    # 0 for the entities that do not move (infinite period)
+        moved = moves.nonzero()[0]
+        if len(moved):
+            timer[moved] -= moves[moved]*period[moved]
+            step = columns["direction"][moved] + 2
+            columns["x"][moved] += EntityStore.STEP_X[step]*moves[moved]
+            columns["y"][moved] += EntityStore.STEP_Y[step]*moves[moved]
+        return moves
+
+    def get_time_to_move(self):
+        """
+        Returns the time (in seconds) left before the next move of any entity, or None if none moves.
+        """
+        n = self.__count
+        if not n:
+            return None
+        left = float((self.__columns["period"][:n] - self.__columns["timer"][:n]).min())
+        return None if left == np.inf else max(left, 0)
+
+    def find(self, pos):
+        """
+        Returns the index of the first entity on a Cell, or -1 if there is none.
+
+        Parameters:
+            pos (tuple): xy position on the Grid.
+        """
+        n = self.__count
+        hits = ((self.__columns["x"][:n] == pos[0]) & (self.__columns["y"][:n] == pos[1])).nonzero()[0]
+        return int(hits[0]) if len(hits) else -1
+
+    def index_of(self, id):
+        """
+        Returns the index of an entity from its id, or -1 if it is not in the store anymore.
+
+        Parameters:
+            id (int): the id of the entity (it never changes, unlike its index).
+        """
+        hits = (self.__columns["id"][:self.__count] == id).nonzero()[0]
+        return int(hits[0]) if len(hits) else -1
+
+    def get_cells(self, time=None):
+        """
+        Drawing system: returns a list of (x, y, type, color, text) for every entity, where text is the number of
+        seconds left before the entity disappears (None if it stays forever or if time is None).
+
+        Parameters:
+            time (float): the game time (in seconds) used for the countdowns. Default=None.
+        """
+        n = self.__count
+        columns = self.__columns
+        types = [KINDS[name]["type"] for name in KIND_NAMES]
+        expiry = columns["expiry"][:n].tolist()
+        texts = [str(e - int(time)) if e != -1 and time is not None else None for e in expiry]
+        return [(x, y, types[k], colors.PALETTE[c], t) for x, y, k, c, t in
+                zip(columns["x"][:n].tolist(), columns["y"][:n].tolist(), columns["kind"][:n].tolist(), columns["color"][:n].tolist(), texts)]
+
+    def get_cell(self, index, time=None):
+        """
+        Returns (type, color, text) of the Cell an entity is drawn in (see get_cells()).
+
+        Parameters:
+            index (int): the index of the entity.
+            time (float): the game time (in seconds) used for the countdown. Default=None.
+        """
+        columns = self.__columns
+        expiry = int(columns["expiry"][index])
+        text = str(expiry - int(time)) if expiry != -1 and time is not None else None
+        return KINDS[self.get_kind(index)]["type"], colors.PALETTE[columns["color"][index]], text
+
+    def get_column(self, name):
+        """
+        Returns a column (a view on the rows in use, which stays valid until the next spawn or removal).
+
+        Parameters:
+            name (string): the name of the column (kind, x, y, direction, speed, period, timer, color, expiry, id).
+        """
+        return self.__columns[name][:self.__count]
+
+    def get_positions(self):
+        """
+        Returns a list of the xy positions of the entities.
+        """
+        n = self.__count
+        return list(zip(self.__columns["x"][:n].tolist(), self.__columns["y"][:n].tolist()))
+
+    def get_pos(self, index):
+        """
+        Returns the xy position of an entity.
+
+        Parameters:
+            index (int): the index of the entity.
+        """
+        return int(self.__columns["x"][index]), int(self.__columns["y"][index])
+
+    def get_kind(self, index):
+        """
+        Returns the name of the kind of an entity.
+
+        Parameters:
+            index (int): the index of the entity.
+        """
+        return KIND_NAMES[self.__columns["kind"][index]]
+
+    def get_kinds(self):
+        """
+        Returns a list of the names of the kinds of the entities.
+        """
+        return [KIND_NAMES[k] for k in self.__columns["kind"][:self.__count].tolist()]
+
+    def get_expiry(self, index):
+        """
+        Returns the game second at which an entity disappears, or None if it stays forever.
+
+        Parameters:
+            index (int): the index of the entity.
+        """
+        expiry = int(self.__columns["expiry"][index])
+        return None if expiry == -1 else expiry
+
+    def get_id(self, index):
+        """
+        Returns the id of an entity.
+
+        Parameters:
+            index (int): the index of the entity.
+        """
+        return int(self.__columns["id"][index])
+
+    def get_stats(self):
+        """
+        Returns a dict with the number of entities spawned, removed, in use, the number of allocated rows and the number
+        of times the columns were reallocated.
+        """
+        return {
+            "spawned": self.__spawned,
+            "removed": self.__removed,
+            "in_use": self.__count,
+            "capacity": len(self.__columns["id"]),
+            "grows": self.__grows,
+        }
+
+    def __grow(self):
+        for name, column in self.__columns.items():
+            self.__columns[name] = np.concatenate([column, np.zeros_like(column)])
+            self.__scratch[name] = np.zeros_like(self.__columns[name])
+        self.__keep = np.zeros(len(self.__keep)*2, bool)
+        self.__grows += 1
+
+    def __len__(self):
+        return self.__count
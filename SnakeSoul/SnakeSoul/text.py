@@ -0,0 +1,134 @@
+import pygame
+from collections import OrderedDict
+
+class FontRegistry:
+    """
+    Keeps one pygame.font.Font per (path, size), so a font file is only opened and parsed once.
+    """
+    def __init__(self):
+        """
+        Initializes the FontRegistry object.
+        """
+        self.__fonts = {}
+
+    def get(self, path, size):
+        """
+        Returns the Font of a font file in the desired size.
+
+        Parameters:
+            path (string): the path of the font file.
+            size (int): the size of the Font.
+        """
+        key = (path, size)
+        font = self.__fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self.__fonts[key] = font
+        return font
+
+class TextCache:
+    """
+    LRU cache of rendered text Surfaces, bounded by the memory the Surfaces use.
+    """
+    def __init__(self, max_bytes=16*1024*1024):
+        """
+        Initializes the TextCache object.
+
+        Parameters:
+            max_bytes (int): the maximum amount of pixel memory (in bytes) kept by the cache. Default=16 MiB.
+        """
+        self.__max_bytes = max_bytes
+        self.__surfaces = OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Returns the Surface of a text, rendering it only if it is not cached yet. The Surface is shared and must not be drawn on.
+
+        Parameters:
+            font (pygame.font.Font): the font of the text.
+            text (string): the text to be rendered.
+            color (tuple): RGB color code of the text.
+            antialias (bool): whether the text is antialiased. Default=True.
+        """
+        key = ("text", font, text, self.__color_key(color), antialias)
+        surface = self.__get(key)
+        if surface is None:
+            surface = self.__put(key, font.render(text, antialias, color))
+        return surface
+
+    def paragraph(self, font, text, color, width):
+        """
+        Returns a Surface with a whole paragraph laid out word by word (a word that does not fit in the width starts a new line).
+
+        Parameters:
+            font (pygame.font.Font): the font of the text.
+            text (string): the paragraph, lines separated by newlines.
+            color (tuple): RGB color code of the text.
+            width (int): the width (in pixels) available for a line.
+        """
+        key = ("paragraph", font, text, self.__color_key(color), width)
+        surface = self.__get(key)
+        if surface is not None:
+            return surface
+
+        words = []
+        space = font.size(' ')[0]
+        x, y, bottom = 0, 0, 1
+        for line in text.splitlines():
+            for word in line.split(' '):
+                word_surface = font.render(word, True, color)
+                word_width, word_height = word_surface.get_size()
+                if x + word_width >= width:
+                    x = 0
+                    y += word_height
+                words.append((word_surface, (x, y)))
+                bottom = max(bottom, y + word_height)
+                x += word_width + space
+            x = 0
+            y += word_height
+
+        # The words are copied (not alpha-blended) so their antialiasing stays the same as blitting them one by one
+        surface = pygame.Surface((width, bottom), pygame.SRCALPHA)
+        for word_surface, pos in words:
+            surface.blit(word_surface, pos, special_flags=pygame.BLEND_RGBA_MAX)
+        return self.__put(key, surface)
+
+    def clear(self):
+        """
+        Removes every cached Surface (the counters are kept).
+        """
+        self.__surfaces.clear()
+        self.__bytes = 0
+
+    def get_stats(self):
+        """
+        Returns a dict with the counters of the cache (hits, misses, evictions, entries, bytes).
+        """
+        return {"hits": self.__hits, "misses": self.__misses, "evictions": self.__evictions,
+                "entries": len(self.__surfaces), "bytes": self.__bytes}
+
+    def __color_key(self, color):
+        # pygame.Color is not hashable, plain tuples and color names are
+        return color if isinstance(color, (tuple, str)) else tuple(color)
+
+    def __get(self, key):
+        surface = self.__surfaces.get(key)
+        if surface is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__surfaces.move_to_end(key)
+        return surface
+
+    def __put(self, key, surface):
+        self.__surfaces[key] = surface
+        self.__bytes += surface.get_pitch()*surface.get_height()
+        while self.__bytes > self.__max_bytes and len(self.__surfaces) > 1:
+            _, old = self.__surfaces.popitem(last=False)
+            self.__bytes -= old.get_pitch()*old.get_height()
+            self.__evictions += 1
+        return surface
@@ -0,0 +1,50 @@
+class FixedTimestep:
+    """
+    Accumulates real time and turns it into fixed simulation ticks, so the game rules always advance by the same dt whatever the frame rate.
+    On a slow machine at most max_ticks ticks are run per frame (the rest of the time is dropped instead of piling up),
+    and on a fast one the time left in the accumulator tells how far the display is between two ticks.
+    """
+    def __init__(self, tick_rate=60, max_ticks=5):
+        """
+        Initializes the FixedTimestep object.
+
+        Parameters:
+            tick_rate (int): the number of simulation ticks per second. Default=60.
+            max_ticks (int): the maximum number of ticks run to catch up in one frame. Default=5.
+        """
+        self.__step = 1/tick_rate
+        self.__max_ticks = max_ticks
+        self.__accumulator = 0
+
+    def advance(self, frame_time):
+        """
+        Adds the real time of a frame and returns the number of ticks to run for it.
+
+        Parameters:
+            frame_time (float): the real time (in seconds) since the previous frame.
+        """
+        self.__accumulator += frame_time
+        ticks = min(int(self.__accumulator/self.__step), self.__max_ticks)
+        self.__accumulator -= ticks*self.__step
+        if ticks == self.__max_ticks:
+            # Too far behind: the simulation slows down instead of spending every frame catching up
+            self.__accumulator = min(self.__accumulator, self.__step)
+        return ticks
+
+    def reset(self):
+        """
+        Drops the accumulated time (e.g. after the game was paused).
+        """
+        self.__accumulator = 0
+
+    def get_step(self):
+        """
+        Returns the duration (in seconds) of one tick.
+        """
+        return self.__step
+
+    def get_alpha(self):
+        """
+        Returns how far the display is between the last tick and the next one, between 0 and 1.
+        """
+        return min(self.__accumulator/self.__step, 1)
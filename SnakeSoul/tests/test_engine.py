@@ -0,0 +1,37 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+from SnakeSoul.engine import Engine
+
+# A reversal (refused by the Snake, but pending until its next move) asked for during a short call, then a turn
+# during a longer one, going down, left, up and right in turn
+TURNS = [2, -1, -2, 1]
+
+def snake_state(state):
+    return state.snake.get_segments_pos(), state.snake.getDirection(), state.snake.get_lives()
+
+def test_fast_forward_keeps_a_pending_reversed_turn():
+    fast, slow = Engine(), Engine()
+    fast_state, slow_state = fast.reset(0), slow.reset(0)
+    for engine in (fast, slow):
+        engine.step(-1, 0.01)
+    fast.fast_forward(2.0, -2)
+    for _ in range(120):
+        slow.step(-2, 1/60)
+    assert snake_state(fast_state) == snake_state(slow_state)
+    assert fast_state.snake.get_head() == (10, 6)
+
+def test_fast_forward_matches_stepping_with_turns():
+    substeps = 400
+    for seed in range(4):
+        fast, slow = Engine(lives=50), Engine(lives=50)
+        fast_state, slow_state = fast.reset(seed), slow.reset(seed)
+        for n in range(40):
+            if n % 2 == 0:
+                action, duration = -TURNS[(n//2 - 1) % len(TURNS)], 0.0137
+            else:
+                action, duration = TURNS[n//2 % len(TURNS)], 1.3713
+            fast.fast_forward(duration, action)
+            for _ in range(substeps):
+                slow.step(action, duration/substeps)
+            assert snake_state(fast_state) == snake_state(slow_state), (seed, n)
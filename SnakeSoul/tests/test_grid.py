@@ -0,0 +1,33 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import random
+import pygame
+from SnakeSoul import colors
+from SnakeSoul.game import Grid, WIDTH, HEIGHT, get_font
+
+def test_dirty_rects_match_a_full_redraw_for_a_view_that_does_not_divide_the_screen():
+    view = 25
+    assert WIDTH % view or (HEIGHT - 360) % view
+    grid = Grid(0, 360, WIDTH, HEIGHT, [view, view], get_font(30))
+    background = pygame.Surface((WIDTH, HEIGHT)).convert()
+    background.fill(colors.dark_green)
+    grid.draw_lines(background)
+    partial = background.copy()
+    full = background.copy()
+    rng = random.Random(0)
+    for _ in range(60):
+        for _ in range(rng.randint(1, 20)):
+            x, y = rng.randrange(view), rng.randrange(view)
+            if rng.random() < 0.3:
+                grid.addObject(x, y, "none", None)
+            else:
+                grid.addObject(x, y, "snake", rng.choice(colors.PALETTE))
+        for rect in grid.get_dirty_rects():
+            partial.set_clip(rect)
+            partial.blit(background, (0, 0))
+            grid.draw(partial, partial.get_clip())
+        partial.set_clip(None)
+        full.blit(background, (0, 0))
+        grid.draw(full)
+        assert pygame.image.tobytes(partial, "RGB") == pygame.image.tobytes(full, "RGB")